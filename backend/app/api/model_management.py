@@ -111,8 +111,13 @@ async def _test_model_functionality(step: str, model: Any) -> Dict[str, Any]:
     
     try:
         if step == "summarization":
-            if hasattr(model, 'summarize'):
+            if hasattr(model, 'asummarize'):
+                result = await model.asummarize(test_text, max_length=50)
+            elif hasattr(model, 'summarize'):
                 result = model.summarize(test_text, max_length=50)
+            else:
+                result = None
+            if result is not None:
                 return {"type": "summarization", "input_length": len(test_text), "output_length": len(result)}
         
         elif step == "embedding":
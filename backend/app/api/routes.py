@@ -268,17 +268,8 @@ async def process_job(job_id: str, upload_id: str, model_strategy: str, preproce
         temp_settings = Settings()
         temp_settings.model_strategy = model_strategy
         
-        # Import and use get_model_adapter with override
-        from app.models.adapter import LocalTransformerAdapter, HuggingFaceInferenceAdapter, HybridAdapter, get_model_adapter
-        
-        if model_strategy == "local":
-            model_adapter = LocalTransformerAdapter()
-        elif model_strategy == "remote":
-            model_adapter = HuggingFaceInferenceAdapter(settings.huggingface_token)
-        elif model_strategy == "ollama":
-            model_adapter = get_model_adapter("ollama")
-        else:  # hybrid
-            model_adapter = HybridAdapter(settings.huggingface_token)
+        # Shared per-strategy adapter so models stay loaded across jobs
+        model_adapter = get_model_adapter(model_strategy)
         
         elapsed = int(time.time() - start_time)
         
@@ -311,7 +302,9 @@ async def process_job(job_id: str, upload_id: str, model_strategy: str, preproce
                 "eta": max(0, estimated_total - elapsed)
             })
         
-        results = extractor.process(processed_segments)
+        # Run the blocking extraction off the event loop; adapters are shared across jobs, so their
+        # single-worker pool is kept for individual forward passes rather than whole jobs
+        results = await asyncio.to_thread(extractor.process, processed_segments)
         
         elapsed = int(time.time() - start_time)
         if model_strategy == "ollama":
@@ -80,6 +80,21 @@ class Settings(BaseSettings):
     # Decision Extraction Strategy: enhanced for better reasoning, original for compatibility
     use_enhanced_decisions: bool = True
     
+    # Load and warm local models at startup instead of on the first request
+    warmup_models_on_startup: bool = True
+    
+    # Engine behind local summarization: transformers pipeline or vLLM (needs vllm, CUDA and a decoder-only summarization_model)
+    local_backend: Literal["transformers", "vllm"] = "transformers"
+    
+    # torch.compile local pipeline models on CUDA (slow first call, faster steady state)
+    compile_local_models: bool = False
+    
+    # Run validator similarity matrices on CUDA when available (off for CPU-only deploys)
+    use_gpu_similarity: bool = False
+    
+    # Models kept loaded by the ModelManager before the least recently used one is released
+    max_cached_models: int = 12
+    
     # Step-specific model configurations
     # Each step can use a different model type and provider
     models: Dict[str, Dict[str, str]] = {
@@ -133,6 +148,8 @@ class Settings(BaseSettings):
     # Directory Configuration
     upload_dir: str = "./uploads"
     output_dir: str = "./outputs"
+    # Per meeting-series speaker embedding centroids for diarization (unset keeps them in memory only)
+    speaker_cache_dir: Optional[str] = None
     
     # File Upload Limits
     max_file_size_mb: int = 50
@@ -144,6 +161,12 @@ class Settings(BaseSettings):
     ner_model: str = "dslim/bert-base-NER"
     # Embeddings: sentence-transformers/all-MiniLM-L6-v2 - Fast CPU inference, great trade-off
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # Token cap for embedding inputs (MiniLM is trained on 256-token sequences)
+    embedding_max_seq_len: int = 256
+    
+    # Pipeline batch sizes for local inference (inputs per forward pass)
+    summarization_batch_size: int = 8
+    ner_batch_size: int = 16
     
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE),
@@ -154,8 +154,9 @@ Return the grouped decisions with improved structure:
         current_tokens = 0
         
         for segment in all_segments:
-            # Estimate tokens (rough approximation: 1 token ≈ 0.75 words)
-            segment_tokens = len(segment.text.split()) * 1.33
+            # Estimate tokens (rough approximation: 1 token ≈ 0.75 words);
+            # counting spaces avoids building a word list per segment
+            segment_tokens = (segment.text.count(' ') + 1) * 1.33
             
             # If adding this segment would exceed max_tokens, start new chunk
             if current_tokens + segment_tokens > max_tokens and current_chunk:
@@ -200,7 +201,7 @@ Return the grouped decisions with improved structure:
         timeline_keywords = ['deadline', 'by', 'before', 'after', 'schedule', 'delay', 'postpone']
         
         for i, seg in enumerate(segments):
-            text_lower = seg.text.lower()
+            text_lower = seg.text_lower
             
             # Check for decision patterns
             decision_score = 0
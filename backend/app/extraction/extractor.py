@@ -1,22 +1,40 @@
 """Information extraction pipeline for meeting intelligence."""
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 from app.models.adapter import ModelAdapter
 from app.preprocessing.parser import TranscriptSegment
 from app.preprocessing.cleaner import TranscriptCleaner
 from app.extraction.specialized_extractors import (
-    IntentTagger, DecisionExtractor, ActionExtractor, RiskExtractor
+    IntentTagger, DecisionExtractor, ActionExtractor, RiskExtractor, build_extraction_context
 )
 from app.extraction.enhanced_decision_extractor import EnhancedDecisionExtractor
 from app.extraction.provenance import ProvenanceTracker
 from app.extraction.validator import ExtractionValidator
 from app.models.model_manager import model_manager
 
+# Aho-Corasick checks a whole keyword set in one pass over each segment
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton over keywords (None without pyahocorasick)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
 
 class MeetingExtractor:
     """Extract structured information from meeting transcripts."""
@@ -32,6 +50,7 @@ class MeetingExtractor:
         'risk', 'concern', 'issue', 'problem', 'blocker', 'blocking',
         'challenge', 'threat', 'warning', 'caution', 'danger', 'worry'
     }
+    _RISK_AUTOMATON = _keyword_automaton(RISK_KEYWORDS)
     
     # Priority keywords
     PRIORITY_KEYWORDS = {
@@ -239,7 +258,9 @@ Create a 2-3 paragraph professional executive summary that captures all key info
         embedding_model = self._get_embedding_model()
         if embedding_model:
             try:
-                self._summary_embedding = embedding_model.encode([summary])[0]
+                # Stored unit-length so confidence scoring is a plain dot product
+                embedding = np.asarray(embedding_model.encode([summary])[0], dtype=np.float32)
+                self._summary_embedding = embedding / (np.linalg.norm(embedding) + 1e-12)
             except:
                 self._summary_embedding = None
     
@@ -251,11 +272,8 @@ Create a 2-3 paragraph professional executive summary that captures all key info
             return self._calculate_keyword_confidence(text)
         
         try:
-            text_embedding = embedding_model.encode([text])[0]
-            similarity = cosine_similarity(
-                [self._summary_embedding],
-                [text_embedding]
-            )[0][0]
+            text_embedding = np.asarray(embedding_model.encode([text])[0], dtype=np.float32)
+            similarity = float(self._summary_embedding @ text_embedding) / (np.linalg.norm(text_embedding) + 1e-12)
             
             # Base confidence from similarity
             if similarity > 0.7:
@@ -343,17 +361,33 @@ Create a 2-3 paragraph professional executive summary that captures all key info
         # Use enhanced specialized extractors that process full context
         from app.config.settings import settings
         
+        uses_llm = hasattr(self.model_adapter, 'extract_structured_data')
+        # The decision/action/risk prompts share one transcript context; build it once
+        context = build_extraction_context(segments) if uses_llm else None
+        
         if settings.use_enhanced_decisions:
             decision_extractor = EnhancedDecisionExtractor(self.model_adapter, embedding_model)
-            decisions = decision_extractor.extract(segments)
+            extract_decisions = lambda: decision_extractor.extract(segments)
         else:
             decision_extractor = DecisionExtractor(self.model_adapter, embedding_model)
-            decisions = decision_extractor.extract([], segments)
+            extract_decisions = lambda: decision_extractor.extract([], segments, context)
         
         action_extractor = ActionExtractor(self.model_adapter, embedding_model)
         risk_extractor = RiskExtractor(self.model_adapter, embedding_model)
-        action_items = action_extractor.extract([], segments)
-        risks = risk_extractor.extract([], segments)
+        
+        if uses_llm:
+            # LLM extraction is I/O-bound, so overlap the three round-trips
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                decisions_future = pool.submit(extract_decisions)
+                actions_future = pool.submit(action_extractor.extract, [], segments, context)
+                risks_future = pool.submit(risk_extractor.extract, [], segments, context)
+                decisions = decisions_future.result()
+                action_items = actions_future.result()
+                risks = risks_future.result()
+        else:
+            decisions = extract_decisions()
+            action_items = action_extractor.extract([], segments)
+            risks = risk_extractor.extract([], segments)
         
         # Add provenance tracking to all items
         decisions = [self.provenance_tracker.track_decision(d, "llm") for d in decisions]
@@ -409,7 +443,7 @@ Create a 2-3 paragraph professional executive summary that captures all key info
         
         # Find segments with decision keywords
         for seg in segments:
-            text_lower = seg.text.lower()
+            text_lower = seg.text_lower
             if any(keyword in text_lower for keyword in self.DECISION_KEYWORDS):
                 # Use semantic confidence
                 confidence = self._calculate_semantic_confidence(seg.text)
@@ -458,7 +492,7 @@ Create a 2-3 paragraph professional executive summary that captures all key info
         
         # Extract from segments
         for seg in segments:
-            text_lower = seg.text.lower()
+            text_lower = seg.text_lower
             
             # Check if segment contains action verbs
             has_action = any(verb in text_lower for verb in self.ACTION_VERBS)
@@ -576,8 +610,12 @@ Create a 2-3 paragraph professional executive summary that captures all key info
                         person_entities[entity.get('word', '').lower()] = entity.get('word', '')
         
         for seg in segments:
-            text_lower = seg.text.lower()
-            if any(keyword in text_lower for keyword in self.RISK_KEYWORDS):
+            text_lower = seg.text_lower
+            if self._RISK_AUTOMATON is not None:
+                has_risk = next(self._RISK_AUTOMATON.iter(text_lower), None) is not None
+            else:
+                has_risk = any(keyword in text_lower for keyword in self.RISK_KEYWORDS)
+            if has_risk:
                 # Use semantic confidence
                 confidence = self._calculate_semantic_confidence(seg.text)
                 
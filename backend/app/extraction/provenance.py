@@ -2,11 +2,19 @@
 import logging
 from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass
+import numpy as np
 from app.preprocessing.parser import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_rows(matrix) -> np.ndarray:
+    """L2-normalize embedding rows so cosine similarity becomes a dot product."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
 @dataclass
 class ProvenanceItem:
     """Represents provenance information for an extracted item."""
@@ -40,7 +48,7 @@ class ProvenanceTracker:
         if embedding_model:
             try:
                 segment_texts = [seg.text for seg in segments]
-                self.segment_embeddings = embedding_model.encode(segment_texts)
+                self.segment_embeddings = _normalize_rows(embedding_model.encode(segment_texts))
                 logger.debug(f"Generated embeddings for {len(segments)} segments")
             except Exception as e:
                 logger.warning(f"Failed to generate embeddings: {e}")
@@ -146,14 +154,10 @@ class ProvenanceTracker:
         """Find provenance using semantic similarity."""
         try:
             # Get embedding for extracted text
-            extracted_embedding = self.embedding_model.encode([extracted_text])[0]
+            extracted_embedding = _normalize_rows(self.embedding_model.encode([extracted_text])[0])
             
-            # Calculate similarities
-            from sklearn.metrics.pairwise import cosine_similarity
-            similarities = cosine_similarity(
-                [extracted_embedding],
-                self.segment_embeddings
-            )[0]
+            # Calculate similarities (rows are pre-normalized, so cosine is a dot product)
+            similarities = self.segment_embeddings @ extracted_embedding
             
             # Find top matching segments
             top_indices = similarities.argsort()[-3:][::-1]  # Top 3 most similar
@@ -187,7 +191,7 @@ class ProvenanceTracker:
         matches = []
         
         for i, segment in enumerate(self.segments):
-            segment_words = set(segment.text.lower().split())
+            segment_words = set(segment.text_lower.split())
             
             # Calculate Jaccard similarity
             overlap = len(extracted_words & segment_words)
@@ -1,22 +1,69 @@
 """Specialized extractors for decisions, actions, and risks with enhanced prompts and context handling."""
+import hashlib
+import logging
 import re
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+# numpy is only needed for embedding-based intent tagging; without it the
+# tagger degrades to the keyword fallback and the pattern extractors still work
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 from app.models.adapter import ModelAdapter
 from app.preprocessing.parser import TranscriptSegment
 from app.preprocessing.cleaner import TranscriptCleaner
 
+logger = logging.getLogger(__name__)
+
+
+def _keyword_regex(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into one case-insensitive alternation (substring semantics)."""
+    return re.compile('|'.join(re.escape(kw) for kw in keywords), re.IGNORECASE)
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
 
-@dataclass
+
+def _dedup_key(text: str) -> str:
+    """Normalize text for duplicate checks (collapsed whitespace, casefolded)."""
+    return _WHITESPACE_RE.sub(' ', text).strip().casefold()
+
+
+def build_extraction_context(segments: List[TranscriptSegment], max_tokens: int = 2500) -> str:
+    """Build context with speaker attribution and natural flow.
+    
+    Decision, action and risk prompts share this context, so callers running all
+    three over the same segments can build it once and pass it to each extract().
+    """
+    context_parts = []
+    current_tokens = 0
+    
+    for seg in segments:
+        # Format: "Speaker: text"
+        segment_text = f"{seg.speaker or 'Speaker'}: {seg.text}"
+        segment_tokens = (len(segment_text) + 3) >> 2  # Rough token estimate (~4 chars/token)
+        
+        if current_tokens + segment_tokens > max_tokens:
+            break
+        
+        context_parts.append(segment_text)
+        current_tokens += segment_tokens
+    
+    return "\n\n".join(context_parts)
+
+
+@dataclass(slots=True, frozen=True)
 class IntentTag:
     """Represents an intent tag for a sentence."""
     sentence: str
     speaker: Optional[str]
     timestamp: Optional[str]
-    intent: List[str]  # ["decision", "action", "risk", "discussion"]
+    intent: Tuple[str, ...]  # ("decision", "action", "risk", "discussion")
     confidence: float
 
 
@@ -61,112 +108,175 @@ class IntentTagger:
         ]
     }
     
+    # Sentences per encode() call and per model forward pass
+    ENCODE_CHUNK_SIZE = 256
+    ENCODE_BATCH_SIZE = 64
+    # Max sentence embeddings kept for reuse across calls
+    EMBED_CACHE_SIZE = 4096
+    
+    _SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s+')
+    
+    # Keyword fallback, checked in order: decision, action, risk
+    _DECISION_KEYWORD_RE = _keyword_regex(['decided', 'agreed', 'approved', 'concluded', 'finalized', 'settled'])
+    _ACTION_KEYWORD_RE = _keyword_regex(['will', 'should', 'need to', 'assigned', 'responsible', 'handle', 'complete'])
+    _RISK_KEYWORD_RE = _keyword_regex(['risk', 'concern', 'issue', 'problem', 'blocker', 'challenge', 'threat'])
+    # Union of all keyword lists; most sentences match none, so one scan settles them
+    _ANY_KEYWORD_RE = re.compile('|'.join(
+        rx.pattern for rx in (_DECISION_KEYWORD_RE, _ACTION_KEYWORD_RE, _RISK_KEYWORD_RE)
+    ), re.IGNORECASE)
+    
     def __init__(self, embedding_model, cleaner: Optional[TranscriptCleaner] = None):
         """Initialize intent tagger with embedding model."""
         self.embedding_model = embedding_model
         self.cleaner = cleaner
-        self._intent_embeddings = None
+        self._intent_labels = list(self.INTENT_EXAMPLES)
+        self._intent_matrix = None
+        self._embed_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
         self._build_intent_embeddings()
     
     def _build_intent_embeddings(self):
         """Pre-compute embeddings for canonical intent examples."""
-        if not self.embedding_model:
+        if not self.embedding_model or not NUMPY_AVAILABLE:
             return
         
         try:
-            self._intent_embeddings = {}
-            for intent, examples in self.INTENT_EXAMPLES.items():
-                embeddings = self.embedding_model.encode(examples)
-                # Average embedding for the intent
-                self._intent_embeddings[intent] = np.mean(embeddings, axis=0)
+            # Encode every example in one batch; offsets mark each intent's rows
+            examples = [example for intent in self._intent_labels for example in self.INTENT_EXAMPLES[intent]]
+            offsets = np.cumsum([0] + [len(self.INTENT_EXAMPLES[intent]) for intent in self._intent_labels])
+            embeddings = np.asarray(self.embedding_model.encode(examples, convert_to_numpy=True), dtype=np.float32)
+            
+            # Average embedding per intent, L2-normalized, as a contiguous (n_intents, d) matrix
+            # so scoring is a single fp32 matmul
+            matrix = np.stack([
+                embeddings[offsets[i]:offsets[i + 1]].mean(axis=0)
+                for i in range(len(self._intent_labels))
+            ])
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+            self._intent_matrix = np.ascontiguousarray(matrix, dtype=np.float32)
         except Exception as e:
             print(f"Warning: Could not build intent embeddings: {e}")
-            self._intent_embeddings = None
+            self._intent_matrix = None
     
     def tag_sentences(self, segments: List[TranscriptSegment]) -> List[IntentTag]:
         """Tag sentences with semantic intents."""
-        if not self._intent_embeddings or not self.embedding_model:
+        if self._intent_matrix is None or not self.embedding_model:
             # Fallback to keyword-based tagging
             return self._tag_with_keywords(segments)
         
-        tags = []
+        # Keyword-decidable sentences are tagged directly; only the rest go to the model,
+        # in one batch instead of one call per sentence
+        tags: List[Optional[IntentTag]] = []
+        pending = []  # (index into tags, sentence, segment)
+        for sentence, seg in self._iter_sentences(segments):
+            keyword_intent = self._tag_sentence_with_keywords(sentence)
+            if keyword_intent:
+                tags.append(IntentTag(
+                    sentence=sentence,
+                    speaker=seg.speaker,
+                    timestamp=seg.timestamp,
+                    intent=(keyword_intent,),
+                    confidence=0.6
+                ))
+            else:
+                pending.append((len(tags), sentence, seg))
+                tags.append(None)
         
-        for seg in segments:
-            # Split segment into sentences
-            sentences = re.split(r'[.!?]+\s+', seg.text)
-            sentences = [s.strip() for s in sentences if s.strip()]
+        if not pending:
+            return tags
+        
+        try:
+            sentence_embeddings = self._encode_sentences([sentence for _, sentence, _ in pending])
+        except Exception:
+            # Fallback for the whole batch
+            return self._tag_with_keywords(segments)
+        
+        # Cosine similarity against every intent at once: (N, d) @ (d, n_intents)
+        sentence_embeddings = sentence_embeddings.astype(np.float32, copy=False)
+        # Clamp the norm so empty or all-padding sentences score 0 instead of NaN
+        sentence_embeddings /= np.maximum(np.linalg.norm(sentence_embeddings, axis=1, keepdims=True), 1e-12)
+        scores = sentence_embeddings @ self._intent_matrix.T
+        above_threshold = scores > 0.6
+        has_intent = above_threshold.any(axis=1)
+        max_scores = scores.max(axis=1).tolist()
+        labels = self._intent_labels
+        
+        for row, (index, sentence, seg) in enumerate(pending):
+            if has_intent[row]:
+                # Intents with high similarity (> 0.6), in label order
+                tagged_intents = tuple(labels[j] for j in np.flatnonzero(above_threshold[row]))
+                confidence = max_scores[row] if tagged_intents != ("discussion",) else 0.4
+            else:
+                # No keyword matched either, so it's discussion
+                tagged_intents = ("discussion",)
+                confidence = 0.4
             
-            for sentence in sentences:
-                if len(sentence) < 10:  # Skip very short sentences
-                    continue
-                
-                try:
-                    # Compute sentence embedding
-                    sentence_embedding = self.embedding_model.encode([sentence])[0]
-                    
-                    # Compare with intent embeddings
-                    intent_scores = {}
-                    for intent, intent_embedding in self._intent_embeddings.items():
-                        similarity = cosine_similarity(
-                            [sentence_embedding],
-                            [intent_embedding]
-                        )[0][0]
-                        intent_scores[intent] = similarity
-                    
-                    # Get intents with high similarity (> 0.6)
-                    tagged_intents = [
-                        intent for intent, score in intent_scores.items()
-                        if score > 0.6
-                    ]
-                    
-                    # If no high-confidence intent, check keywords
-                    if not tagged_intents:
-                        keyword_intent = self._tag_sentence_with_keywords(sentence)
-                        if keyword_intent:
-                            tagged_intents = [keyword_intent]
-                    
-                    # If still no intent, it's discussion
-                    if not tagged_intents:
-                        tagged_intents = ["discussion"]
-                    
-                    # Calculate confidence
-                    max_score = max(intent_scores.values()) if intent_scores else 0.5
-                    confidence = max_score if tagged_intents != ["discussion"] else 0.4
-                    
-                    tags.append(IntentTag(
-                        sentence=sentence,
-                        speaker=seg.speaker,
-                        timestamp=seg.timestamp,
-                        intent=tagged_intents,
-                        confidence=confidence
-                    ))
-                    
-                except Exception:
-                    # Fallback for this sentence
-                    intent = self._tag_sentence_with_keywords(sentence)
-                    tags.append(IntentTag(
-                        sentence=sentence,
-                        speaker=seg.speaker,
-                        timestamp=seg.timestamp,
-                        intent=[intent] if intent else ["discussion"],
-                        confidence=0.6 if intent else 0.4
-                    ))
+            tags[index] = IntentTag(
+                sentence=sentence,
+                speaker=seg.speaker,
+                timestamp=seg.timestamp,
+                intent=tagged_intents,
+                confidence=confidence
+            )
         
         return tags
     
-    def _tag_sentence_with_keywords(self, sentence: str) -> Optional[str]:
-        """Fallback keyword-based intent tagging."""
-        sentence_lower = sentence.lower()
+    def _iter_sentences(self, segments: List[TranscriptSegment]):
+        """Yield (sentence, segment) pairs, skipping very short sentences."""
+        split = self._SENTENCE_SPLIT_RE.split
+        for seg in segments:
+            for sentence in split(seg.text):
+                sentence = sentence.strip()
+                if len(sentence) >= 10:
+                    yield sentence, seg
+    
+    def _encode_sentences(self, sentences: List[str]) -> "np.ndarray":
+        """Encode sentences in batches, reusing cached embeddings for repeated sentences."""
+        keys = [hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).digest() for sentence in sentences]
+        
+        # Unique sentences that still need a forward pass
+        misses = {}
+        for key, sentence in zip(keys, sentences):
+            if key not in self._embed_cache and key not in misses:
+                misses[key] = sentence
+        
+        encoded = {}
+        if misses:
+            miss_sentences = list(misses.values())
+            # sentence-transformers sorts each batch by length internally to limit padding
+            miss_embeddings = np.concatenate([
+                self.embedding_model.encode(
+                    miss_sentences[start:start + self.ENCODE_CHUNK_SIZE],
+                    batch_size=self.ENCODE_BATCH_SIZE,
+                    convert_to_numpy=True
+                )
+                for start in range(0, len(miss_sentences), self.ENCODE_CHUNK_SIZE)
+            ])
+            encoded = dict(zip(misses, miss_embeddings))
+        
+        embeddings = []
+        for key in keys:
+            if key in encoded:
+                embeddings.append(encoded[key])
+            else:
+                self._embed_cache.move_to_end(key)
+                embeddings.append(self._embed_cache[key])
         
-        decision_keywords = ['decided', 'agreed', 'approved', 'concluded', 'finalized', 'settled']
-        action_keywords = ['will', 'should', 'need to', 'assigned', 'responsible', 'handle', 'complete']
-        risk_keywords = ['risk', 'concern', 'issue', 'problem', 'blocker', 'challenge', 'threat']
+        # Insert after gathering so eviction never drops an entry this call still needs
+        self._embed_cache.update(encoded)
+        while len(self._embed_cache) > self.EMBED_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
         
-        if any(kw in sentence_lower for kw in decision_keywords):
+        return np.stack(embeddings)
+    
+    def _tag_sentence_with_keywords(self, sentence: str) -> Optional[str]:
+        """Fallback keyword-based intent tagging."""
+        if not self._ANY_KEYWORD_RE.search(sentence):
+            return None
+        if self._DECISION_KEYWORD_RE.search(sentence):
             return "decision"
-        elif any(kw in sentence_lower for kw in action_keywords):
+        elif self._ACTION_KEYWORD_RE.search(sentence):
             return "action"
-        elif any(kw in sentence_lower for kw in risk_keywords):
+        elif self._RISK_KEYWORD_RE.search(sentence):
             return "risk"
         
         return None
@@ -174,19 +284,15 @@ class IntentTagger:
     def _tag_with_keywords(self, segments: List[TranscriptSegment]) -> List[IntentTag]:
         """Fallback keyword-based tagging for all segments."""
         tags = []
-        for seg in segments:
-            sentences = re.split(r'[.!?]+\s+', seg.text)
-            for sentence in sentences:
-                if len(sentence) < 10:
-                    continue
-                intent = self._tag_sentence_with_keywords(sentence)
-                tags.append(IntentTag(
-                    sentence=sentence,
-                    speaker=seg.speaker,
-                    timestamp=seg.timestamp,
-                    intent=[intent] if intent else ["discussion"],
-                    confidence=0.6 if intent else 0.4
-                ))
+        for sentence, seg in self._iter_sentences(segments):
+            intent = self._tag_sentence_with_keywords(sentence)
+            tags.append(IntentTag(
+                sentence=sentence,
+                speaker=seg.speaker,
+                timestamp=seg.timestamp,
+                intent=(intent,) if intent else ("discussion",),
+                confidence=0.6 if intent else 0.4
+            ))
         return tags
 
 
@@ -250,26 +356,51 @@ Return decisions in this EXACT JSON format:
 Prioritize decisions with concrete, measurable outcomes.
 Return ONLY valid JSON, no explanations."""
 
+    # Segments that may contain a decision
+    _DECISION_TRIGGER_RE = _keyword_regex([
+        'decided', 'decision', 'agreed', 'approved', 'concluded',
+        'finalized', 'settled', 'voted', 'unanimously', 'let\'s make',
+        'we will', 'we\'re going with', 'push the', 'change the', 'move to'
+    ])
+
+    # Core decision patterns, tried in order
+    _DECISION_PATTERNS = [
+        re.compile(p, re.IGNORECASE) for p in (
+            r'(?:decided|agreed|approved|concluded|finalized|settled)\s+(?:to|that|on)\s+([^.!?]+)',
+            r'(?:we|the team|everyone)\s+(?:will|are going to)\s+([^.!?]+)',
+            r'(?:let\'s|we\'re)\s+(?:make|go with|push|change|move)\s+([^.!?]+)',
+            r'(?:push|change|move)\s+(?:the|our)\s+([^.!?]+)\s+(?:to|from)',
+        )
+    ]
+    _RATIONALE_PATTERNS = [
+        re.compile(r'(?:because|since|due to|given that|to provide|to ensure|to give)\s+([^.!?]+)', re.IGNORECASE),
+    ]
+    _GROUP_DECISION_RE = re.compile(r'\b(we|team|everyone|unanimously|all)\b', re.IGNORECASE)
+    # Whole words (not substrings like "within") that mark a continuation turn
+    _CONTINUATION_WORDS = frozenset({'to', 'will', 'with', 'for'})
+
     def __init__(self, model_adapter: ModelAdapter, embedding_model=None):
         """Initialize decision extractor."""
         self.model_adapter = model_adapter
         self.embedding_model = embedding_model
+        # Ollama adapters support structured prompts; resolve once instead of per call
+        self._structured_fn = getattr(model_adapter, 'extract_structured_data', None)
     
-    def extract(self, tagged_sentences: List[IntentTag], all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
+    def extract(self, tagged_sentences: List[IntentTag], all_segments: List[TranscriptSegment],
+                context: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract decisions with enhanced context and prompting."""
-        
-        # Check if this is an Ollama adapter (supports structured prompts)
-        if hasattr(self.model_adapter, 'extract_structured_data'):
-            return self._extract_with_llm(all_segments)
-        else:
-            return self._extract_with_patterns(all_segments)
+        if self._structured_fn:
+            return self._extract_with_llm(all_segments, context)
+        return self._extract_with_patterns(all_segments)
     
-    def _extract_with_llm(self, all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
+    def _extract_with_llm(self, all_segments: List[TranscriptSegment],
+                          context: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract decisions using LLM structured prompts (for Ollama)."""
-        context = self._build_extraction_context(all_segments)
+        if context is None:
+            context = build_extraction_context(all_segments)
         
         try:
-            response = self.model_adapter.extract_structured_data(
+            response = self._structured_fn(
                 self.DECISION_PROMPT.format(context=context)
             )
             return response.get("decisions", [])
@@ -280,22 +411,13 @@ Return ONLY valid JSON, no explanations."""
     def _extract_with_patterns(self, all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
         """Extract decisions using pattern matching (fallback)."""
         
-        # Build full context instead of processing individual sentences
-        context = self._build_extraction_context(all_segments)
-        
         # For HuggingFace models, we'll process in chunks and extract patterns
         decisions = []
         
         # First, try to find decision patterns in segments
-        decision_keywords = ['decided', 'decision', 'agreed', 'approved', 'concluded', 
-                           'finalized', 'settled', 'voted', 'unanimously', 'let\'s make', 
-                           'we will', 'we\'re going with', 'push the', 'change the', 'move to']
-        
         for i, seg in enumerate(all_segments):
-            text_lower = seg.text.lower()
-            
             # Check if this segment contains decision keywords
-            if any(kw in text_lower for kw in decision_keywords):
+            if self._DECISION_TRIGGER_RE.search(seg.text):
                 # Build context around this decision (previous and next segments)
                 context_segments = []
                 
@@ -313,53 +435,29 @@ Return ONLY valid JSON, no explanations."""
         
         return decisions
     
-    def _build_extraction_context(self, segments: List[TranscriptSegment], max_tokens: int = 2500) -> str:
-        """Build context with speaker attribution and natural flow."""
-        context_parts = []
-        current_tokens = 0
-        
-        for seg in segments:
-            # Format: "Speaker: text"
-            segment_text = f"{seg.speaker or 'Speaker'}: {seg.text}"
-            segment_tokens = len(segment_text.split()) * 1.3  # Rough token estimate
-            
-            if current_tokens + segment_tokens > max_tokens:
-                break
-                
-            context_parts.append(segment_text)
-            current_tokens += segment_tokens
-        
-        return "\n\n".join(context_parts)
-    
     def _extract_decision_from_context(self, decision_seg: TranscriptSegment, 
                                      context_segments: List[TranscriptSegment], 
                                      seg_index: int) -> Optional[Dict[str, Any]]:
         """Extract decision details from context segments."""
         
         # Build the decision text - may span multiple segments
-        decision_text = decision_seg.text
+        decision_parts = [decision_seg.text]
         
         # Check if next segments continue the decision
         for i in range(1, min(3, len(context_segments) - seg_index)):
             next_seg = context_segments[seg_index + i] if seg_index + i < len(context_segments) else None
             if next_seg and (next_seg.speaker == decision_seg.speaker or 
-                           any(kw in next_seg.text.lower() for kw in ['to', 'will', 'with', 'for'])):
+                           not self._CONTINUATION_WORDS.isdisjoint(next_seg.text_lower.split()[:8])):
                 # This segment likely continues the decision
-                decision_text += " " + next_seg.text
+                decision_parts.append(next_seg.text)
             else:
                 break
+        decision_text = " ".join(decision_parts)
         
         # Extract the core decision
-        decision_patterns = [
-            r'(?:decided|agreed|approved|concluded|finalized|settled)\s+(?:to|that|on)\s+([^.!?]+)',
-            r'(?:we|the team|everyone)\s+(?:will|are going to)\s+([^.!?]+)',
-            r'(?:let\'s|we\'re)\s+(?:make|go with|push|change|move)\s+([^.!?]+)',
-            r'(?:push|change|move)\s+(?:the|our)\s+([^.!?]+)\s+(?:to|from)',
-        ]
-        
         core_decision = None
-        for pattern in decision_patterns:
-            match = re.search(pattern, decision_text, re.IGNORECASE)
+        for pattern in self._DECISION_PATTERNS:
+            match = pattern.search(decision_text)
             if match:
                 core_decision = match.group(0).strip()
                 break
@@ -369,11 +467,8 @@ Return ONLY valid JSON, no explanations."""
         
         # Extract rationale
         rationale = None
-        rationale_patterns = [
-            r'(?:because|since|due to|given that|to provide|to ensure|to give)\s+([^.!?]+)',
-        ]
-        for pattern in rationale_patterns:
-            match = re.search(pattern, decision_text, re.IGNORECASE)
+        for pattern in self._RATIONALE_PATTERNS:
+            match = pattern.search(decision_text)
             if match:
                 rationale = match.group(1).strip()
                 break
@@ -384,7 +479,7 @@ Return ONLY valid JSON, no explanations."""
             participants.append(decision_seg.speaker)
         
         # Look for group decisions
-        if re.search(r'\b(we|team|everyone|unanimously|all)\b', decision_text.lower()):
+        if self._GROUP_DECISION_RE.search(decision_text):
             # Add other speakers from context
             for seg in context_segments:
                 if seg.speaker and seg.speaker not in participants:
@@ -401,8 +496,7 @@ Return ONLY valid JSON, no explanations."""
     
     def _is_duplicate(self, sentence: str, seen: set) -> bool:
         """Check if sentence is duplicate of seen decisions."""
-        key = sentence.lower()[:50].strip()
-        return key in seen
+        return _dedup_key(sentence)[:50] in seen
     
     def _deduplicate_decisions(self, decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Deduplicate and merge similar decisions - currently disabled for better results."""
@@ -478,42 +572,76 @@ Return in this EXACT JSON format:
 Extract EVERY clear task assignment. Include all names mentioned.
 Return ONLY valid JSON, no explanations."""
 
+    # Action patterns that indicate clear assignments, as (pattern, owner group, action group);
+    # an owner group of None means the current speaker owns the action
+    _ACTION_PATTERNS = [
+        (re.compile(p, re.IGNORECASE), owner_group, action_group) for p, owner_group, action_group in (
+            (r'([A-Za-z]+),?\s+(?:can you|could you|please|will you)\s+([^.!?]+)', 1, 2),  # direct request
+            (r'([A-Za-z]+)\s+(?:will|is going to|needs to|should|must)\s+([^.!?]+)', 1, 2),  # "X will ..."
+            (r"(?:I'll|I will|I'm going to)\s+([^.!?]+)", None, 1),  # first person
+            (r'(?:let\'s have|ask|get)\s+([A-Za-z]+)\s+(?:to\s+)?([^.!?]+)', 1, 2),  # delegation
+            (r'([A-Za-z]+)\s*[-–]\s*([^.!?]+)', 1, 2),  # "X - ..."
+            (r'assigned to\s+([A-Za-z]+):\s*([^.!?]+)', 1, 2),  # "assigned to X: ..."
+        )
+    ]
+    # Union of all action patterns; a miss means no individual pattern can match either
+    _ANY_ACTION_RE = re.compile(
+        '|'.join(f'(?:{pattern.pattern})' for pattern, _, _ in _ACTION_PATTERNS), re.IGNORECASE
+    )
+    _DUE_DATE_PATTERNS = [
+        (re.compile(p, re.IGNORECASE), replacement) for p, replacement in (
+            (r'by\s+(end of day|EOD)\s+tomorrow', 'end of day tomorrow'),
+            (r'by\s+([A-Za-z]+day)', None),  # Monday, Tuesday, etc.
+            (r'by\s+(next week|this week|tomorrow|today)', None),
+            (r'by\s+([A-Za-z]+\s+\d{1,2}(?:st|nd|rd|th)?)', None),  # July 15th
+            (r'(?:within|in)\s+(\d+\s+(?:days?|weeks?))', None),
+            (r'(?:deadline|due):\s*([^.!?,]+)', None),
+        )
+    ]
+    _TITLE_PREFIX_RE = re.compile(r'^(Dr\.|Mr\.|Ms\.|Mrs\.)\s*', re.IGNORECASE)
+    _HIGH_PRIORITY_RE = _keyword_regex(['urgent', 'critical', 'asap', 'immediately', 'priority',
+                                        'important', 'blocker', 'blocking', 'must'])
+    _LOW_PRIORITY_RE = _keyword_regex(['when possible', 'nice to have', 'optional', 'low priority'])
+
     def __init__(self, model_adapter: ModelAdapter, embedding_model=None):
         """Initialize action extractor."""
         self.model_adapter = model_adapter
         self.embedding_model = embedding_model
+        # Ollama adapters support structured prompts; resolve once instead of per call
+        self._structured_fn = getattr(model_adapter, 'extract_structured_data', None)
     
-    def extract(self, tagged_sentences: List[IntentTag], all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
+    def extract(self, tagged_sentences: List[IntentTag], all_segments: List[TranscriptSegment],
+                context: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract action items with enhanced owner detection."""
         
-        print(f"[DEBUG] ActionExtractor.extract: Starting extraction with {len(all_segments)} segments")
-        print(f"[DEBUG] ActionExtractor.extract: Model adapter type: {type(self.model_adapter).__name__}")
-        print(f"[DEBUG] ActionExtractor.extract: Has extract_structured_data: {hasattr(self.model_adapter, 'extract_structured_data')}")
+        logger.debug(
+            "ActionExtractor.extract: %d segments, adapter %s, structured extraction: %s",
+            len(all_segments), type(self.model_adapter).__name__, self._structured_fn is not None
+        )
         
-        # Check if this is an Ollama adapter (supports structured prompts)
-        if hasattr(self.model_adapter, 'extract_structured_data'):
-            print(f"[DEBUG] ActionExtractor.extract: Using LLM extraction")
-            result = self._extract_with_llm(all_segments)
-            print(f"[DEBUG] ActionExtractor.extract: LLM extraction returned {len(result)} items")
+        if self._structured_fn:
+            logger.debug("ActionExtractor.extract: Using LLM extraction")
+            result = self._extract_with_llm(all_segments, context)
+            logger.debug("ActionExtractor.extract: LLM extraction returned %d items", len(result))
             return result
         else:
-            print(f"[DEBUG] ActionExtractor.extract: Using pattern matching")
+            logger.debug("ActionExtractor.extract: Using pattern matching")
             result = self._extract_with_patterns(all_segments)
-            print(f"[DEBUG] ActionExtractor.extract: Pattern matching returned {len(result)} items")
+            logger.debug("ActionExtractor.extract: Pattern matching returned %d items", len(result))
             return result
     
-    def _extract_with_llm(self, all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
+    def _extract_with_llm(self, all_segments: List[TranscriptSegment],
+                          context: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract action items using LLM structured prompts (for Ollama)."""
-        context = self._build_extraction_context(all_segments)
+        if context is None:
+            context = build_extraction_context(all_segments)
         
-        print(f"[DEBUG] ActionExtractor: Using LLM extraction with context length: {len(context)}")
-        print(f"[DEBUG] ActionExtractor: First 500 chars of context: {context[:500]}...")
+        logger.debug("ActionExtractor: Using LLM extraction with context length: %d", len(context))
         
         try:
-            response = self.model_adapter.extract_structured_data(
+            response = self._structured_fn(
                 self.ACTION_PROMPT.format(context=context)
             )
-            print(f"[DEBUG] ActionExtractor: LLM response: {response}")
             action_items = response.get("action_items", [])
             
             # Ensure all action items have confidence values
@@ -523,7 +651,7 @@ Return ONLY valid JSON, no explanations."""
                 if "priority" not in action:
                     action["priority"] = "medium"  # Default priority
             
-            print(f"[DEBUG] ActionExtractor: Found {len(action_items)} action items")
+            logger.debug("ActionExtractor: Found %d action items", len(action_items))
             return action_items
         except Exception as e:
             print(f"[ERROR] ActionExtractor: LLM extraction failed: {e}, falling back to pattern matching")
@@ -534,66 +662,43 @@ Return ONLY valid JSON, no explanations."""
     def _extract_with_patterns(self, all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
         """Extract action items using pattern matching (fallback)."""
         
-        print(f"[DEBUG] ActionExtractor: Using pattern matching fallback with {len(all_segments)} segments")
+        logger.debug("ActionExtractor: Using pattern matching fallback with %d segments", len(all_segments))
         action_items = []
         seen_actions = set()
         
-        # Action patterns that indicate clear assignments
-        action_patterns = [
-            (r'([A-Za-z]+),?\s+(?:can you|could you|please|will you)\s+([^.!?]+)', 'direct_request'),
-            (r'([A-Za-z]+)\s+(?:will|is going to|needs to|should|must)\s+([^.!?]+)', 'will_pattern'),
-            (r"(?:I'll|I will|I'm going to)\s+([^.!?]+)", 'first_person'),
-            (r'(?:let\'s have|ask|get)\s+([A-Za-z]+)\s+(?:to\s+)?([^.!?]+)', 'delegation'),
-            (r'([A-Za-z]+)\s*[-–]\s*([^.!?]+)', 'dash_pattern'),
-            (r'assigned to\s+([A-Za-z]+):\s*([^.!?]+)', 'assigned_pattern'),
-        ]
-        
         for seg in all_segments:
             text = seg.text
+            
+            # One scan rules out segments that no action pattern can match
+            if not self._ANY_ACTION_RE.search(text):
+                continue
+            
             speaker = seg.speaker or "Unknown"
+            due_date = priority = None
             
             # Try each action pattern
-            for pattern, pattern_type in action_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                
-                for match in matches:
-                    owner = None
-                    action_text = None
-                    
-                    if pattern_type == 'direct_request':
-                        owner = match.group(1)
-                        action_text = match.group(2)
-                    elif pattern_type == 'will_pattern':
-                        owner = match.group(1)
-                        action_text = match.group(2)
-                    elif pattern_type == 'first_person':
-                        owner = speaker
-                        action_text = match.group(1)
-                    elif pattern_type == 'delegation':
-                        owner = match.group(1)
-                        action_text = match.group(2)
-                    elif pattern_type == 'dash_pattern':
-                        owner = match.group(1)
-                        action_text = match.group(2)
-                    elif pattern_type == 'assigned_pattern':
-                        owner = match.group(1)
-                        action_text = match.group(2)
+            for pattern, owner_group, action_group in self._ACTION_PATTERNS:
+                for match in pattern.finditer(text):
+                    owner = match.group(owner_group) if owner_group else speaker
+                    action_text = match.group(action_group)
                     
                     if owner and action_text:
                         # Clean up the action text
                         action_text = action_text.strip().rstrip('.,')
                         
                         # Skip if too short or already seen
-                        if len(action_text) < 10 or action_text.lower() in seen_actions:
+                        if len(action_text) < 10:
+                            continue
+                        action_key = _dedup_key(action_text)
+                        if action_key in seen_actions:
                             continue
                         
-                        seen_actions.add(action_text.lower())
-                        
-                        # Extract due date
-                        due_date = self._extract_due_date(text)
+                        seen_actions.add(action_key)
                         
-                        # Determine priority
-                        priority = self._determine_priority(text)
+                        # Due date and priority depend only on the segment text
+                        if priority is None:
+                            due_date = self._extract_due_date(text)
+                            priority = self._determine_priority(text)
                         
                         action_items.append({
                             "action": action_text,
@@ -610,17 +715,8 @@ Return ONLY valid JSON, no explanations."""
     
     def _extract_due_date(self, text: str) -> Optional[str]:
         """Extract due date from text."""
-        date_patterns = [
-            (r'by\s+(end of day|EOD)\s+tomorrow', 'end of day tomorrow'),
-            (r'by\s+([A-Za-z]+day)', None),  # Monday, Tuesday, etc.
-            (r'by\s+(next week|this week|tomorrow|today)', None),
-            (r'by\s+([A-Za-z]+\s+\d{1,2}(?:st|nd|rd|th)?)', None),  # July 15th
-            (r'(?:within|in)\s+(\d+\s+(?:days?|weeks?))', None),
-            (r'(?:deadline|due):\s*([^.!?,]+)', None),
-        ]
-        
-        for pattern, replacement in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, replacement in self._DUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if replacement:
                     return replacement
@@ -631,15 +727,9 @@ Return ONLY valid JSON, no explanations."""
     
     def _determine_priority(self, text: str) -> str:
         """Determine priority based on keywords."""
-        text_lower = text.lower()
-        
-        high_priority_words = ['urgent', 'critical', 'asap', 'immediately', 'priority', 
-                              'important', 'blocker', 'blocking', 'must']
-        low_priority_words = ['when possible', 'nice to have', 'optional', 'low priority']
-        
-        if any(word in text_lower for word in high_priority_words):
+        if self._HIGH_PRIORITY_RE.search(text):
             return "high"
-        elif any(word in text_lower for word in low_priority_words):
+        elif self._LOW_PRIORITY_RE.search(text):
             return "low"
         else:
             return "medium"
@@ -651,39 +741,22 @@ Return ONLY valid JSON, no explanations."""
         
         # Clean up the owner name
         owner = owner.strip()
+        owner_lower = owner.lower()
         
         # Handle pronouns
-        if owner.lower() in ['i', "i'll", "i'm"]:
+        if owner_lower in ['i', "i'll", "i'm"]:
             return speaker
-        elif owner.lower() in ['you']:
+        elif owner_lower in ['you']:
             return "Unclear"
         
         # Remove common titles
-        owner = re.sub(r'^(Dr\.|Mr\.|Ms\.|Mrs\.)\s*', '', owner, flags=re.IGNORECASE)
+        owner = self._TITLE_PREFIX_RE.sub('', owner)
         
         # Capitalize properly
         owner = owner.title()
         
         return owner
     
-    def _build_extraction_context(self, segments: List[TranscriptSegment], max_tokens: int = 2500) -> str:
-        """Build context with speaker attribution and natural flow."""
-        context_parts = []
-        current_tokens = 0
-        
-        for seg in segments:
-            # Format: "Speaker: text"
-            segment_text = f"{seg.speaker or 'Speaker'}: {seg.text}"
-            segment_tokens = len(segment_text.split()) * 1.3  # Rough token estimate
-            
-            if current_tokens + segment_tokens > max_tokens:
-                break
-                
-            context_parts.append(segment_text)
-            current_tokens += segment_tokens
-        
-        return "\n\n".join(context_parts)
-    
     def _deduplicate_actions(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Deduplicate actions - currently disabled."""
         return actions  # Temporarily disabled
@@ -761,26 +834,63 @@ Return in this EXACT JSON format:
 Include ALL concrete risks with specific details. Capture numbers, dates, and thresholds.
 Return ONLY valid JSON, no explanations."""
 
+    # Patterns to extract risk descriptions
+    _RISK_DESCRIPTION_PATTERNS = [
+        re.compile(p, re.IGNORECASE) for p in (
+            r'(?:risk|concern|worried)\s+(?:is\s+)?(?:that\s+)?([^.!?]+)',
+            r'(?:issue|problem|blocker)\s+(?:is\s+)?(?:with\s+)?([^.!?]+)',
+            r'if\s+(?:we\s+)?(?:don\'t|can\'t)\s+([^,]+),\s*([^.!?]+)',
+            r'(?:might|could)\s+(?:not\s+)?([^.!?]+)',
+            r'(?:delay|constraint|bottleneck)\s+(?:in|with|on)\s+([^.!?]+)',
+        )
+    ]
+    # Union of the description patterns; segments matching none go straight to the fallback
+    _ANY_RISK_DESCRIPTION_RE = re.compile(
+        '|'.join(f'(?:{p.pattern})' for p in _RISK_DESCRIPTION_PATTERNS), re.IGNORECASE
+    )
+    _LEADING_FILLER_RE = re.compile(r'^(that|is|with)\s+', re.IGNORECASE)
+    _SPEAKER_PREFIX_RE = re.compile(r'^\s*\w+:\s*')
+    
+    # Risk indicator keywords
+    _RISK_INDICATOR_RE = _keyword_regex([
+        'risk', 'concern', 'worried', 'issue', 'problem', 'blocker', 'blocking',
+        'challenge', 'threat', 'delay', 'might not', 'could fail', 'won\'t have',
+        'if we don\'t', 'if we can\'t', 'dependency', 'constraint', 'bottleneck',
+        'vulnerability', 'exposure', 'gap', 'shortfall', 'deficit'
+    ])
+    _CLEAR_RISK_RE = _keyword_regex(['risk', 'concern', 'blocker', 'issue'])
+    
+    # Category keywords, checked in priority order
+    _RISK_CATEGORY_PATTERNS = [
+        ("Timeline", _keyword_regex(['delay', 'deadline', 'schedule', 'timeline', 'launch', 'date', 'week', 'month'])),
+        ("Technical", _keyword_regex(['integration', 'performance', 'bug', 'system', 'api', 'technical', 'data', 'security'])),
+        ("Resource", _keyword_regex(['budget', 'staff', 'person', 'capacity', 'resource', 'team', 'engineer', 'support'])),
+        ("Regulatory", _keyword_regex(['compliance', 'legal', 'audit', 'regulation', 'gdpr', 'ccpa', 'privacy'])),
+        ("Business", _keyword_regex(['customer', 'market', 'competitor', 'stakeholder', 'revenue', 'adoption'])),
+    ]
+
     def __init__(self, model_adapter: ModelAdapter, embedding_model=None):
         """Initialize risk extractor."""
         self.model_adapter = model_adapter
         self.embedding_model = embedding_model
+        # Ollama adapters support structured prompts; resolve once instead of per call
+        self._structured_fn = getattr(model_adapter, 'extract_structured_data', None)
     
-    def extract(self, tagged_sentences: List[IntentTag], all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
+    def extract(self, tagged_sentences: List[IntentTag], all_segments: List[TranscriptSegment],
+                context: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract risks with proper categorization."""
-        
-        # Check if this is an Ollama adapter (supports structured prompts)
-        if hasattr(self.model_adapter, 'extract_structured_data'):
-            return self._extract_with_llm(all_segments)
-        else:
-            return self._extract_with_patterns(all_segments)
+        if self._structured_fn:
+            return self._extract_with_llm(all_segments, context)
+        return self._extract_with_patterns(all_segments)
     
-    def _extract_with_llm(self, all_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
+    def _extract_with_llm(self, all_segments: List[TranscriptSegment],
+                          context: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract risks using LLM structured prompts (for Ollama)."""
-        context = self._build_extraction_context(all_segments)
+        if context is None:
+            context = build_extraction_context(all_segments)
         
         try:
-            response = self.model_adapter.extract_structured_data(
+            response = self._structured_fn(
                 self.RISK_PROMPT.format(context=context)
             )
             return response.get("risks", [])
@@ -794,35 +904,32 @@ Return ONLY valid JSON, no explanations."""
         risks = []
         seen_risks = set()
         
-        # Risk indicator patterns
-        risk_patterns = [
-            'risk', 'concern', 'worried', 'issue', 'problem', 'blocker', 'blocking',
-            'challenge', 'threat', 'delay', 'might not', 'could fail', 'won\'t have',
-            'if we don\'t', 'if we can\'t', 'dependency', 'constraint', 'bottleneck',
-            'vulnerability', 'exposure', 'gap', 'shortfall', 'deficit'
-        ]
+        # Bind per-segment callables once; this loop runs over the whole transcript
+        has_risk_indicator = self._RISK_INDICATOR_RE.search
+        extract_description = self._extract_risk_description
+        categorize = self._categorize_risk
         
         for seg in all_segments:
-            text_lower = seg.text.lower()
-            speaker = seg.speaker or "Unknown"
-            
             # Check if segment contains risk indicators
-            if any(pattern in text_lower for pattern in risk_patterns):
-                # Extract the risk description
-                risk_desc = self._extract_risk_description(seg.text)
-                
-                if risk_desc and risk_desc.lower() not in seen_risks:
-                    seen_risks.add(risk_desc.lower())
-                    
-                    # Categorize the risk
-                    category = self._categorize_risk(risk_desc)
-                    
-                    risks.append({
-                        "risk": risk_desc,
-                        "category": category,
-                        "mentioned_by": speaker,
-                        "confidence": 0.85
-                    })
+            if not has_risk_indicator(seg.text):
+                continue
+            
+            # Extract the risk description
+            risk_desc = extract_description(seg.text)
+            if not risk_desc:
+                continue
+            
+            risk_key = risk_desc.lower()
+            if risk_key in seen_risks:
+                continue
+            seen_risks.add(risk_key)
+            
+            risks.append({
+                "risk": risk_desc,
+                "category": categorize(risk_desc),
+                "mentioned_by": seg.speaker or "Unknown",
+                "confidence": 0.85
+            })
         
         # Remove duplicates (temporarily disabled)
         # risks = self._deduplicate_risks(risks)
@@ -832,17 +939,9 @@ Return ONLY valid JSON, no explanations."""
     def _extract_risk_description(self, text: str) -> Optional[str]:
         """Extract clear risk description from text."""
         
-        # Patterns to extract risk descriptions
-        risk_extraction_patterns = [
-            r'(?:risk|concern|worried)\s+(?:is\s+)?(?:that\s+)?([^.!?]+)',
-            r'(?:issue|problem|blocker)\s+(?:is\s+)?(?:with\s+)?([^.!?]+)',
-            r'if\s+(?:we\s+)?(?:don\'t|can\'t)\s+([^,]+),\s*([^.!?]+)',
-            r'(?:might|could)\s+(?:not\s+)?([^.!?]+)',
-            r'(?:delay|constraint|bottleneck)\s+(?:in|with|on)\s+([^.!?]+)',
-        ]
-        
-        for pattern in risk_extraction_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        patterns = self._RISK_DESCRIPTION_PATTERNS if self._ANY_RISK_DESCRIPTION_RE.search(text) else ()
+        for pattern in patterns:
+            match = pattern.search(text)
             if match:
                 # Extract and clean the risk description
                 if match.lastindex and match.lastindex > 1:
@@ -853,7 +952,7 @@ Return ONLY valid JSON, no explanations."""
                     risk_desc = match.group(1).strip()
                 
                 # Clean up the description
-                risk_desc = re.sub(r'^(that|is|with)\s+', '', risk_desc, flags=re.IGNORECASE)
+                risk_desc = self._LEADING_FILLER_RE.sub('', risk_desc)
                 risk_desc = risk_desc.rstrip('.,')
                 
                 # Ensure it's substantial
@@ -861,9 +960,9 @@ Return ONLY valid JSON, no explanations."""
                     return risk_desc
         
         # Fallback: use the whole segment if it's clearly a risk
-        if any(word in text.lower() for word in ['risk', 'concern', 'blocker', 'issue']):
+        if self._CLEAR_RISK_RE.search(text):
             # Clean up the text
-            clean_text = re.sub(r'^\s*\w+:\s*', '', text)  # Remove speaker prefix
+            clean_text = self._SPEAKER_PREFIX_RE.sub('', text)  # Remove speaker prefix
             clean_text = clean_text.strip().rstrip('.,')
             if len(clean_text) > 20 and len(clean_text) < 200:
                 return clean_text
@@ -872,46 +971,10 @@ Return ONLY valid JSON, no explanations."""
     
     def _categorize_risk(self, risk_desc: str) -> str:
         """Categorize risk based on content."""
-        risk_lower = risk_desc.lower()
-        
-        # Category keywords
-        timeline_words = ['delay', 'deadline', 'schedule', 'timeline', 'launch', 'date', 'week', 'month']
-        technical_words = ['integration', 'performance', 'bug', 'system', 'api', 'technical', 'data', 'security']
-        resource_words = ['budget', 'staff', 'person', 'capacity', 'resource', 'team', 'engineer', 'support']
-        regulatory_words = ['compliance', 'legal', 'audit', 'regulation', 'gdpr', 'ccpa', 'privacy']
-        business_words = ['customer', 'market', 'competitor', 'stakeholder', 'revenue', 'adoption']
-        
-        # Check categories
-        if any(word in risk_lower for word in timeline_words):
-            return "Timeline"
-        elif any(word in risk_lower for word in technical_words):
-            return "Technical"
-        elif any(word in risk_lower for word in resource_words):
-            return "Resource"
-        elif any(word in risk_lower for word in regulatory_words):
-            return "Regulatory"
-        elif any(word in risk_lower for word in business_words):
-            return "Business"
-        else:
-            return "Other"
-    
-    def _build_extraction_context(self, segments: List[TranscriptSegment], max_tokens: int = 2500) -> str:
-        """Build context with speaker attribution and natural flow."""
-        context_parts = []
-        current_tokens = 0
-        
-        for seg in segments:
-            # Format: "Speaker: text"
-            segment_text = f"{seg.speaker or 'Speaker'}: {seg.text}"
-            segment_tokens = len(segment_text.split()) * 1.3  # Rough token estimate
-            
-            if current_tokens + segment_tokens > max_tokens:
-                break
-                
-            context_parts.append(segment_text)
-            current_tokens += segment_tokens
-        
-        return "\n\n".join(context_parts)
+        for category, pattern in self._RISK_CATEGORY_PATTERNS:
+            if pattern.search(risk_desc):
+                return category
+        return "Other"
     
     def _deduplicate_risks(self, risks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Deduplicate risks - currently disabled."""
@@ -1,17 +1,143 @@
 """Validation system for extracted items to detect hallucinations and errors."""
+import copy
+import hashlib
 import logging
 import re
+import threading
 from typing import List, Dict, Any, Optional, Tuple
-from collections import Counter
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 import difflib
+from itertools import accumulate
+import numpy as np
 from app.preprocessing.parser import TranscriptSegment
+from app.config.settings import settings
+
+# RE2 matches in linear time; the stdlib engine backtracks on the '.*' contradiction pairs
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Aho-Corasick finds every key phrase in one pass over the transcript
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# RapidFuzz scores name similarity in C++; difflib is the pure-Python fallback
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Validation results shared by every validator in the process (MeetingExtractor builds one per job),
+# keyed on (embedding model id, transcript digest, item type, item text)
+_VALIDATION_CACHE: "OrderedDict[Tuple[Optional[int], bytes, str, str], Dict[str, Any]]" = OrderedDict()
+_VALIDATION_CACHE_LOCK = threading.Lock()
+
+# Words that don't make a key phrase meaningful on their own
+_STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
+
+@dataclass
+class _SourceIndex:
+    """Transcript views shared by every check in one validation pass."""
+    segments: List[TranscriptSegment]
+    text: str
+    text_lower: str
+    tokens: frozenset
+    speakers: frozenset
+    # Speaker name -> lowercase form, for fuzzy matching
+    speaker_names: Dict[str, str]
+    digest: bytes
+    # Unit-length segment embeddings, encoded on first semantic check
+    segment_embeddings: Optional[np.ndarray] = None
+    # Same matrix resident on the similarity device, when one is configured
+    segment_embeddings_device: Any = None
+
+
+def _build_source_index(segments: List[TranscriptSegment]) -> _SourceIndex:
+    """Join, lowercase and tokenize the transcript once."""
+    text = ' '.join([seg.text for seg in segments])
+    text_lower = text.lower()
+    speakers = frozenset(seg.speaker for seg in segments if seg.speaker)
+    return _SourceIndex(
+        segments=segments,
+        text=text,
+        text_lower=text_lower,
+        tokens=frozenset(text_lower.split()),
+        speakers=speakers,
+        speaker_names={speaker: speaker.lower() for speaker in speakers},
+        digest=hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    )
+
+
+def _find_substrings(needles, haystack: str) -> set:
+    """Return the needles that occur in haystack, in a single pass when pyahocorasick is installed."""
+    needles = set(needles)
+    # The automaton cannot hold the empty string, which every haystack contains
+    words = needles - {''}
+    if not AHOCORASICK_AVAILABLE or not words:
+        return {needle for needle in needles if needle in haystack}
+    
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    found = {word for _, word in automaton.iter(haystack)}
+    return found | (needles - words)
+
+
+def _compile_pattern(pattern: str, ignorecase: bool = False):
+    """Compile with RE2 when installed, otherwise with the stdlib re module."""
+    if RE2_AVAILABLE:
+        # re2 takes no re.* flags, so case-insensitivity goes inline
+        return re2.compile(f'(?i){pattern}' if ignorecase else pattern)
+    return re.compile(pattern, re.IGNORECASE if ignorecase else 0)
+
 
 class ExtractionValidator:
     """Validates extractions against source material and common sense."""
     
+    # Opposing statements in either order, merged into one alternation
+    _CONTRADICTION_RE = _compile_pattern('|'.join((
+        r'\byes\b.*\bno\b', r'\bno\b.*\byes\b',
+        r'\bwill\b.*\bwon\'t\b', r'\bwon\'t\b.*\bwill\b',
+        r'\bcan\b.*\bcan\'t\b', r'\bcan\'t\b.*\bcan\b',
+        r'\bagree\b.*\bdisagree\b', r'\bdisagree\b.*\bagree\b',
+    )), ignorecase=True)
+    
+    # Owner detection: capitalized names or personal pronouns
+    _NAME_RE = _compile_pattern(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b')
+    _PRONOUN_RE = _compile_pattern(r'\b(I|we|he|she|they)\b', ignorecase=True)
+    
+    # Accepted due-date formats, merged into one alternation
+    _DATE_FORMAT_RE = re.compile('|'.join((
+        r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
+        r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
+        r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',  # Day names
+        r'\b(next|this|last)\s+(week|month|quarter)\b',  # Relative dates
+    )), re.IGNORECASE)
+    
+    _ACTION_VERBS = frozenset({
+        'send', 'create', 'update', 'review', 'complete', 'finish',
+        'schedule', 'organize', 'prepare', 'develop', 'implement',
+        'follow', 'contact', 'coordinate', 'analyze', 'test'
+    })
+    _DECISION_WORDS = frozenset({
+        'decided', 'decision', 'agreed', 'approved', 'chosen',
+        'concluded', 'determined', 'resolved', 'settled', 'finalized'
+    })
+    
+    # Max entries in the process-wide validation cache
+    VALIDATION_CACHE_SIZE = 1024
+    
     def __init__(self, embedding_model=None):
         """Initialize validator.
         
@@ -22,6 +148,28 @@ class ExtractionValidator:
         self.known_names = set()
         self.company_names = set()
         self.common_roles = {'manager', 'director', 'engineer', 'analyst', 'lead', 'coordinator'}
+        # validate_decisions/actions/risks usually run back to back on the same segments
+        self._source_index: Optional[_SourceIndex] = None
+        # Semantic support depends on the model, so results are only shared between validators using the same one
+        self._model_key = id(embedding_model) if embedding_model is not None else None
+        self._similarity_device = self._resolve_similarity_device()
+    
+    def _resolve_similarity_device(self) -> Optional[str]:
+        """Return 'cuda' when GPU similarity is enabled and available, else None (NumPy on CPU)."""
+        if not settings.use_gpu_similarity:
+            return None
+        try:
+            import torch
+            return 'cuda' if torch.cuda.is_available() else None
+        except ImportError:
+            return None
+    
+    def _get_source_index(self, source_segments: List[TranscriptSegment]) -> _SourceIndex:
+        """Return the source index for these segments, rebuilding only when they change."""
+        index = self._source_index
+        if index is None or index.segments is not source_segments or len(index.segments) != len(source_segments):
+            index = self._source_index = _build_source_index(source_segments)
+        return index
     
     def validate_decisions(self, decisions: List[Dict[str, Any]], source_segments: List[TranscriptSegment]) -> List[Dict[str, Any]]:
         """Validate extracted decisions.
@@ -34,19 +182,19 @@ class ExtractionValidator:
             Decisions with validation information
         """
         validated_decisions = []
+        source = self._get_source_index(source_segments)
+        validations = self._validate_items(
+            [decision.get('decision', decision.get('text', '')) for decision in decisions],
+            source,
+            item_type='decision'
+        )
         
-        for decision in decisions:
-            validation = self._validate_single_item(
-                decision.get('decision', decision.get('text', '')),
-                source_segments,
-                item_type='decision'
-            )
-            
+        for decision, validation in zip(decisions, validations):
             # Add validation info
             decision['validation'] = validation
             
             # Check for decision-specific issues
-            decision_validation = self._validate_decision_logic(decision, source_segments)
+            decision_validation = self._validate_decision_logic(decision, source)
             decision['validation'].update(decision_validation)
             
             validated_decisions.append(decision)
@@ -64,19 +212,19 @@ class ExtractionValidator:
             Actions with validation information
         """
         validated_actions = []
+        source = self._get_source_index(source_segments)
+        validations = self._validate_items(
+            [action.get('action', '') for action in actions],
+            source,
+            item_type='action'
+        )
         
-        for action in actions:
-            validation = self._validate_single_item(
-                action.get('action', ''),
-                source_segments,
-                item_type='action'
-            )
-            
+        for action, validation in zip(actions, validations):
             # Add validation info
             action['validation'] = validation
             
             # Check for action-specific issues
-            action_validation = self._validate_action_logic(action, source_segments)
+            action_validation = self._validate_action_logic(action, source)
             action['validation'].update(action_validation)
             
             validated_actions.append(action)
@@ -94,14 +242,14 @@ class ExtractionValidator:
             Risks with validation information
         """
         validated_risks = []
+        source = self._get_source_index(source_segments)
+        validations = self._validate_items(
+            [risk.get('risk', '') for risk in risks],
+            source,
+            item_type='risk'
+        )
         
-        for risk in risks:
-            validation = self._validate_single_item(
-                risk.get('risk', ''),
-                source_segments,
-                item_type='risk'
-            )
-            
+        for risk, validation in zip(risks, validations):
             # Add validation info
             risk['validation'] = validation
             
@@ -109,13 +257,60 @@ class ExtractionValidator:
         
         return validated_risks
     
-    def _validate_single_item(self, item_text: str, source_segments: List[TranscriptSegment], item_type: str) -> Dict[str, Any]:
+    def _validate_items(self, item_texts: List[str], source: _SourceIndex, item_type: str) -> List[Dict[str, Any]]:
+        """Validate a batch of items, reusing cached results for items already validated on this transcript."""
+        keys = [(self._model_key, source.digest, item_type, item_text) for item_text in item_texts]
+        
+        # Copy hits out first so inserting this batch's misses can't evict them mid-batch
+        hits = {}
+        with _VALIDATION_CACHE_LOCK:
+            for key in keys:
+                validation = _VALIDATION_CACHE.get(key)
+                if validation is not None:
+                    _VALIDATION_CACHE.move_to_end(key)
+                    hits[key] = validation
+        
+        # Only texts without a cached result are encoded and validated; hits must match exactly,
+        # since a near-duplicate with a different date or number can have a different verdict
+        misses = list(dict.fromkeys(key[3] for key in keys if key not in hits))
+        lexical_supports = {item_text: self._lexical_support(item_text, source) for item_text in misses}
+        
+        # Items the lexical checks already settle never reach the encoder
+        to_encode = [item_text for item_text in misses if not self._is_decisive(*lexical_supports[item_text])]
+        semantic_supports = dict(zip(
+            to_encode,
+            self._batch_semantic_support(self._encode_items(to_encode), source, len(to_encode))
+        ))
+        
+        computed = {
+            item_text: self._validate_single_item(
+                item_text, source, item_type,
+                semantic_supports.get(item_text), lexical_supports[item_text]
+            )
+            for item_text in misses
+        }
+        
+        # Insert and trim only once the batch is done
+        with _VALIDATION_CACHE_LOCK:
+            for item_text, validation in computed.items():
+                _VALIDATION_CACHE[(self._model_key, source.digest, item_type, item_text)] = validation
+            while len(_VALIDATION_CACHE) > self.VALIDATION_CACHE_SIZE:
+                _VALIDATION_CACHE.popitem(last=False)
+        
+        # Callers annotate the returned dicts in place
+        return [copy.deepcopy(hits[key] if key in hits else computed[key[3]]) for key in keys]
+    
+    def _validate_single_item(self, item_text: str, source: _SourceIndex, item_type: str,
+                              semantic_support: Optional[float] = None,
+                              lexical_support: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
         """Validate a single extracted item.
         
         Args:
             item_text: Text of extracted item
-            source_segments: Original segments
+            source: Index over the original segments
             item_type: Type of item (decision, action, risk)
+            semantic_support: Precomputed semantic support, if already batch-encoded
+            lexical_support: Precomputed (phrase support, word overlap), if already scored
             
         Returns:
             Validation results
@@ -129,7 +324,7 @@ class ExtractionValidator:
         }
         
         # Check for hallucination
-        hallucination_check = self._check_hallucination(item_text, source_segments)
+        hallucination_check = self._check_hallucination(item_text, source, semantic_support, lexical_support)
         validation.update(hallucination_check)
         
         # Check for logical consistency
@@ -148,33 +343,38 @@ class ExtractionValidator:
         
         return validation
     
-    def _check_hallucination(self, item_text: str, source_segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    def _check_hallucination(self, item_text: str, source: _SourceIndex,
+                             semantic_support: Optional[float] = None,
+                             lexical_support: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
         """Check if item text appears to be hallucinated.
         
         Args:
             item_text: Text to check
-            source_segments: Source segments
+            source: Index over the source segments
+            semantic_support: Precomputed semantic support, if already batch-encoded
+            lexical_support: Precomputed (phrase support, word overlap), if already scored
             
         Returns:
             Hallucination check results
         """
-        if not item_text or not source_segments:
+        if not item_text or not source.segments:
             return {'source_support': 0.0, 'word_overlap': 0.0}
         
-        item_words = set(item_text.lower().split())
-        source_text = ' '.join([seg.text for seg in source_segments]).lower()
-        source_words = set(source_text.split())
+        if lexical_support is None:
+            lexical_support = self._lexical_support(item_text, source)
+        source_support, word_overlap = lexical_support
         
-        # Calculate word overlap
-        overlap = len(item_words & source_words)
-        word_overlap = overlap / len(item_words) if item_words else 0.0
-        
-        # Check for phrases that appear in source
-        source_support = self._calculate_phrase_support(item_text, source_text)
+        # Clearly supported or clearly unsupported: skip the embedding pass
+        if self._is_decisive(source_support, word_overlap):
+            return {
+                'source_support': source_support,
+                'word_overlap': word_overlap
+            }
         
         # Use semantic similarity if available
         if self.embedding_model:
-            semantic_support = self._calculate_semantic_support(item_text, source_segments)
+            if semantic_support is None:
+                semantic_support = self._calculate_semantic_support(item_text, source)
             source_support = max(source_support, semantic_support)
         
         return {
@@ -182,68 +382,119 @@ class ExtractionValidator:
             'word_overlap': word_overlap
         }
     
+    def _lexical_support(self, item_text: str, source: _SourceIndex) -> Tuple[float, float]:
+        """Phrase support and word overlap of an item against the source."""
+        item_words = set(item_text.lower().split())
+        
+        # Calculate word overlap
+        overlap = len(item_words & source.tokens)
+        word_overlap = overlap / len(item_words) if item_words else 0.0
+        
+        # Check for phrases that appear in source
+        return self._calculate_phrase_support(item_text, source.text_lower), word_overlap
+    
+    @staticmethod
+    def _is_decisive(source_support: float, word_overlap: float) -> bool:
+        """Whether phrase and word checks settle support without embeddings."""
+        return source_support >= 0.8 or (source_support == 0.0 and word_overlap == 0.0)
+    
     def _calculate_phrase_support(self, item_text: str, source_text: str) -> float:
-        """Calculate how well item phrases are supported by source."""
+        """Calculate how well item phrases are supported by source (source_text already lowercased)."""
         item_text = item_text.lower()
-        source_text = source_text.lower()
         
         # Check for exact phrase matches
         phrases = self._extract_key_phrases(item_text)
-        supported_phrases = 0
+        if not phrases:
+            return 0.0
         
-        for phrase in phrases:
-            if phrase in source_text:
-                supported_phrases += 1
+        found = _find_substrings(phrases, source_text)
+        supported_phrases = sum(1 for phrase in phrases if phrase in found)
         
-        return supported_phrases / len(phrases) if phrases else 0.0
+        return supported_phrases / len(phrases)
     
     def _extract_key_phrases(self, text: str) -> List[str]:
         """Extract key phrases from text for matching."""
-        # Extract noun phrases and important phrases
-        phrases = []
-        
         # Simple extraction: sequences of 2-4 words
-        words = text.split()
-        for i in range(len(words)):
-            for length in [2, 3, 4]:
-                if i + length <= len(words):
-                    phrase = ' '.join(words[i:i+length])
-                    # Skip if phrase is mostly stopwords
-                    if self._is_meaningful_phrase(phrase):
-                        phrases.append(phrase.lower())
-        
-        return phrases
-    
-    def _is_meaningful_phrase(self, phrase: str) -> bool:
-        """Check if phrase is meaningful (not mostly stopwords)."""
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        words = phrase.lower().split()
+        words = text.lower().split()
         
-        if len(words) < 2:
-            return False
+        # Prefix sums of stopword flags give each window's stopword count in O(1)
+        stop_counts = list(accumulate((word in _STOPWORDS for word in words), initial=0))
         
-        meaningful_words = [w for w in words if w not in stopwords]
-        return len(meaningful_words) >= len(words) * 0.5
+        # Skip phrases that are mostly stopwords
+        return [
+            ' '.join(words[i:i + length])
+            for i in range(len(words))
+            for length in (2, 3, 4)
+            if i + length <= len(words) and 2 * (stop_counts[i + length] - stop_counts[i]) <= length
+        ]
     
-    def _calculate_semantic_support(self, item_text: str, source_segments: List[TranscriptSegment]) -> float:
+    def _calculate_semantic_support(self, item_text: str, source: _SourceIndex) -> float:
         """Calculate semantic similarity support."""
         try:
-            item_embedding = self.embedding_model.encode([item_text])[0]
-            
-            max_similarity = 0.0
-            for segment in source_segments:
-                segment_embedding = self.embedding_model.encode([segment.text])[0]
-                
-                from sklearn.metrics.pairwise import cosine_similarity
-                similarity = cosine_similarity([item_embedding], [segment_embedding])[0][0]
-                max_similarity = max(max_similarity, similarity)
+            segment_embeddings = self._get_segment_embeddings(source)
+            item_embedding = np.asarray(self.embedding_model.encode([item_text])[0], dtype=np.float32)
             
-            return float(max_similarity)
+            # Cosine against every segment in one matrix-vector product
+            similarities = segment_embeddings @ item_embedding / max(np.linalg.norm(item_embedding), 1e-12)
+            return float(max(0.0, similarities.max()))
             
         except Exception as e:
             logger.warning(f"Semantic similarity calculation failed: {e}")
             return 0.0
     
+    def _batch_semantic_support(self, item_embeddings: Optional[np.ndarray], source: _SourceIndex,
+                                count: int) -> List[Optional[float]]:
+        """Semantic support for many items with one matrix product."""
+        if item_embeddings is None or not source.segments:
+            return [None] * count
+        
+        try:
+            segment_embeddings = self._get_segment_embeddings(source)
+            
+            if self._similarity_device:
+                import torch
+                if source.segment_embeddings_device is None:
+                    source.segment_embeddings_device = torch.from_numpy(segment_embeddings).to(self._similarity_device)
+                items = torch.from_numpy(item_embeddings).to(self._similarity_device)
+                similarities = items @ source.segment_embeddings_device.T
+                return similarities.max(dim=1).values.clamp(min=0.0).cpu().tolist()
+            
+            # (items, d) @ (d, segments): best-matching segment per item
+            similarities = item_embeddings @ segment_embeddings.T
+            return np.maximum(similarities.max(axis=1), 0.0).tolist()
+        
+        except Exception as e:
+            logger.warning(f"Semantic similarity calculation failed: {e}")
+            return [0.0] * count
+    
+    def _encode_items(self, item_texts: List[str]) -> Optional[np.ndarray]:
+        """Encode item texts in one call as unit-length rows (None without a model)."""
+        if not self.embedding_model or not item_texts:
+            return None
+        
+        try:
+            item_embeddings = np.asarray(
+                self.embedding_model.encode(item_texts, batch_size=64, convert_to_numpy=True),
+                dtype=np.float32
+            )
+            item_embeddings /= np.maximum(np.linalg.norm(item_embeddings, axis=1, keepdims=True), 1e-12)
+            return item_embeddings
+        
+        except Exception as e:
+            logger.warning(f"Semantic similarity calculation failed: {e}")
+            return None
+    
+    def _get_segment_embeddings(self, source: _SourceIndex) -> np.ndarray:
+        """Encode the source segments once per index and keep them normalized."""
+        if source.segment_embeddings is None:
+            embeddings = np.asarray(
+                self.embedding_model.encode([seg.text for seg in source.segments], batch_size=32, convert_to_numpy=True),
+                dtype=np.float32
+            )
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+            source.segment_embeddings = embeddings
+        return source.segment_embeddings
+    
     def _check_logical_consistency(self, item_text: str, item_type: str) -> List[Dict[str, str]]:
         """Check for logical consistency issues."""
         issues = []
@@ -277,40 +528,15 @@ class ExtractionValidator:
     
     def _contains_contradiction(self, text: str) -> bool:
         """Check if text contains contradictory statements."""
-        contradiction_patterns = [
-            (r'\byes\b.*\bno\b', r'\bno\b.*\byes\b'),
-            (r'\bwill\b.*\bwon\'t\b', r'\bwon\'t\b.*\bwill\b'),
-            (r'\bcan\b.*\bcan\'t\b', r'\bcan\'t\b.*\bcan\b'),
-            (r'\bagree\b.*\bdisagree\b', r'\bdisagree\b.*\bagree\b'),
-        ]
-        
-        text_lower = text.lower()
-        for pattern1, pattern2 in contradiction_patterns:
-            if re.search(pattern1, text_lower) or re.search(pattern2, text_lower):
-                return True
-        
-        return False
+        return bool(self._CONTRADICTION_RE.search(text))
     
     def _has_clear_action_verb(self, text: str) -> bool:
         """Check if action text has clear action verbs."""
-        action_verbs = {
-            'send', 'create', 'update', 'review', 'complete', 'finish',
-            'schedule', 'organize', 'prepare', 'develop', 'implement',
-            'follow', 'contact', 'coordinate', 'analyze', 'test'
-        }
-        
-        words = text.lower().split()
-        return any(verb in words for verb in action_verbs)
+        return not self._ACTION_VERBS.isdisjoint(text.lower().split())
     
     def _has_decision_language(self, text: str) -> bool:
         """Check if decision text has decisive language."""
-        decision_words = {
-            'decided', 'decision', 'agreed', 'approved', 'chosen',
-            'concluded', 'determined', 'resolved', 'settled', 'finalized'
-        }
-        
-        words = text.lower().split()
-        return any(word in words for word in decision_words)
+        return not self._DECISION_WORDS.isdisjoint(text.lower().split())
     
     def _check_completeness(self, item_text: str, item_type: str) -> List[Dict[str, str]]:
         """Check if extracted item is complete."""
@@ -346,36 +572,33 @@ class ExtractionValidator:
     def _has_owner(self, text: str) -> bool:
         """Check if action text has clear owner."""
         # Look for names or pronouns
-        name_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b'
-        pronoun_pattern = r'\b(I|we|he|she|they)\b'
-        
-        return bool(re.search(name_pattern, text) or re.search(pronoun_pattern, text, re.IGNORECASE))
+        return bool(self._NAME_RE.search(text) or self._PRONOUN_RE.search(text))
     
-    def _validate_decision_logic(self, decision: Dict[str, Any], source_segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    def _validate_decision_logic(self, decision: Dict[str, Any], source: _SourceIndex) -> Dict[str, Any]:
         """Validate decision-specific logic."""
         validation = {}
         
         # Check if participants are mentioned in source
         participants = decision.get('participants', [])
         if participants:
-            validation['participant_validation'] = self._validate_participants(participants, source_segments)
+            validation['participant_validation'] = self._validate_participants(participants, source)
         
         # Check for quantitative data validation
         if 'quantitative_data' in decision:
             validation['quantitative_validation'] = self._validate_quantitative_data(
-                decision['quantitative_data'], source_segments
+                decision['quantitative_data'], source
             )
         
         return validation
     
-    def _validate_action_logic(self, action: Dict[str, Any], source_segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    def _validate_action_logic(self, action: Dict[str, Any], source: _SourceIndex) -> Dict[str, Any]:
         """Validate action-specific logic."""
         validation = {}
         
         # Validate owner exists in meeting
         owner = action.get('owner')
         if owner:
-            validation['owner_validation'] = self._validate_owner(owner, source_segments)
+            validation['owner_validation'] = self._validate_owner(owner, source)
         
         # Validate due date format
         due_date = action.get('due_date')
@@ -384,10 +607,10 @@ class ExtractionValidator:
         
         return validation
     
-    def _validate_participants(self, participants: List[str], source_segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    def _validate_participants(self, participants: List[str], source: _SourceIndex) -> Dict[str, Any]:
         """Validate that participants appear in source."""
-        source_text = ' '.join([seg.text for seg in source_segments]).lower()
-        source_speakers = set([seg.speaker for seg in source_segments if seg.speaker])
+        source_text = source.text_lower
+        source_speakers = source.speakers
         
         validated_participants = []
         for participant in participants:
@@ -399,7 +622,7 @@ class ExtractionValidator:
                 })
             else:
                 # Check for fuzzy matching
-                close_match = self._find_close_name_match(participant, source_speakers)
+                close_match = self._find_close_name_match(participant, source.speaker_names)
                 validated_participants.append({
                     'name': participant,
                     'found_in_source': False,
@@ -412,23 +635,34 @@ class ExtractionValidator:
             'validation_rate': sum(1 for p in validated_participants if p['found_in_source']) / len(validated_participants)
         }
     
-    def _find_close_name_match(self, name: str, source_names: set) -> Optional[str]:
-        """Find close name matches using fuzzy matching."""
+    def _find_close_name_match(self, name: str, source_names: Dict[str, str]) -> Optional[str]:
+        """Find close name matches using fuzzy matching (source_names maps each name to its lowercase form)."""
         best_match = None
         best_ratio = 0.7  # Minimum similarity threshold
         
-        for source_name in source_names:
-            ratio = difflib.SequenceMatcher(None, name.lower(), source_name.lower()).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = source_name
+        if RAPIDFUZZ_AVAILABLE:
+            result = process.extractOne(
+                name.lower(),
+                source_names,
+                scorer=fuzz.ratio,
+                score_cutoff=best_ratio * 100
+            )
+            return result[2] if result and result[1] > best_ratio * 100 else None
+        
+        # The cheap upper bounds skip the full ratio() for candidates that cannot win
+        matcher = difflib.SequenceMatcher(None, name.lower())
+        for source_name, source_lower in source_names.items():
+            matcher.set_seq2(source_lower)
+            if matcher.real_quick_ratio() > best_ratio and matcher.quick_ratio() > best_ratio:
+                ratio = matcher.ratio()
+                if ratio > best_ratio:
+                    best_ratio = ratio
+                    best_match = source_name
         
         return best_match
     
-    def _validate_quantitative_data(self, quant_data: Dict[str, Any], source_segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    def _validate_quantitative_data(self, quant_data: Dict[str, Any], source: _SourceIndex) -> Dict[str, Any]:
         """Validate quantitative data against source."""
-        source_text = ' '.join([seg.text for seg in source_segments])
-        
         validation = {
             'dates_validated': [],
             'numbers_validated': [],
@@ -437,36 +671,31 @@ class ExtractionValidator:
         
         # Validate dates
         dates = quant_data.get('dates', [])
+        found_dates = _find_substrings((date.lower() for date in dates), source.text_lower)
         for date in dates:
-            if date.lower() in source_text.lower():
-                validation['dates_validated'].append({'date': date, 'found': True})
-            else:
-                validation['dates_validated'].append({'date': date, 'found': False})
+            validation['dates_validated'].append({'date': date, 'found': date.lower() in found_dates})
         
         # Validate numbers
         numbers = quant_data.get('numbers', [])
+        found_numbers = _find_substrings((str(number) for number in numbers), source.text)
         for number in numbers:
-            if str(number) in source_text:
-                validation['numbers_validated'].append({'number': number, 'found': True})
-            else:
-                validation['numbers_validated'].append({'number': number, 'found': False})
+            validation['numbers_validated'].append({'number': number, 'found': str(number) in found_numbers})
         
         return validation
     
-    def _validate_owner(self, owner: str, source_segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    def _validate_owner(self, owner: str, source: _SourceIndex) -> Dict[str, Any]:
         """Validate that action owner appears in meeting."""
-        source_speakers = set([seg.speaker for seg in source_segments if seg.speaker])
-        source_text = ' '.join([seg.text for seg in source_segments]).lower()
+        source_speakers = source.speakers
         
         found_as_speaker = owner in source_speakers
-        mentioned_in_text = owner.lower() in source_text
+        mentioned_in_text = owner.lower() in source.text_lower
         
         return {
             'owner': owner,
             'found_as_speaker': found_as_speaker,
             'mentioned_in_text': mentioned_in_text,
             'is_valid': found_as_speaker or mentioned_in_text,
-            'close_match': self._find_close_name_match(owner, source_speakers) if not found_as_speaker else None
+            'close_match': self._find_close_name_match(owner, source.speaker_names) if not found_as_speaker else None
         }
     
     def _validate_date_format(self, date_str: str) -> Dict[str, Any]:
@@ -478,18 +707,8 @@ class ExtractionValidator:
         }
         
         # Try to parse various date formats
-        import datetime
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-            r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',  # Day names
-            r'\b(next|this|last)\s+(week|month|quarter)\b',  # Relative dates
-        ]
-        
-        for pattern in date_patterns:
-            if re.search(pattern, date_str.lower()):
-                validation['format_valid'] = True
-                break
+        if self._DATE_FORMAT_RE.search(date_str):
+            validation['format_valid'] = True
         
         # Check if date is reasonable (not too far in past/future)
         if validation['format_valid']:
@@ -1,10 +1,12 @@
 """FastAPI application entry point for Meeting Intelligence Agent."""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.api.model_management import router as model_router
 from app.api.evaluation_routes import router as evaluation_router
 from app.config.settings import settings
+from app.models.adapter import get_model_adapter
 
 app = FastAPI(
     title="Meeting Intelligence Agent API",
@@ -15,34 +17,8 @@ app = FastAPI(
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",  # Vite dev server (default)
-        "http://localhost:3000",  # Alternative React dev server
-        "http://localhost:8080",  # Vite custom port
-        "http://localhost:8081",  # Vite alternative port
-        "http://localhost:8082",  # Vite alternative port
-        "http://localhost:8083",  # Vite alternative port
-        "http://localhost:8084",  # Vite alternative port
-        "http://localhost:8085",  # Vite alternative port
-        "http://localhost:8086",  # Vite alternative port
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:8080",
-        "http://127.0.0.1:8081",  # Frontend port
-        "http://127.0.0.1:8082",
-        "http://127.0.0.1:8083",
-        "http://127.0.0.1:8084",
-        "http://127.0.0.1:8085",
-        "http://127.0.0.1:8086",
-        "http://[::1]:5173",  # IPv6 localhost
-        "http://[::1]:8080",
-        "http://[::1]:8081",
-        "http://[::1]:8082",
-        "http://[::1]:8083",
-        "http://[::1]:8084",
-        "http://[::1]:8085",
-        "http://[::1]:8086",
-    ],
+    # Local dev frontends: Vite (5173, 8080-8086) and React (3000) on IPv4/IPv6 loopback
+    allow_origin_regex=r"^http://(localhost|127\.0\.0\.1|\[::1\]):(3000|5173|808[0-6])$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -55,6 +31,32 @@ app.include_router(model_router)
 app.include_router(evaluation_router)
 
 
+# Keeps the background warmup task referenced until it finishes
+_warmup_task = None
+
+
+def _warmup():
+    """Preload and warm the configured strategy's local models."""
+    try:
+        adapter = get_model_adapter()
+        warmup = getattr(adapter, "warmup", None)
+        if warmup is not None:
+            warmup()
+            print(f"[INFO] Warmed up models for '{settings.model_strategy}' strategy")
+    except Exception as e:
+        # Models still lazy-load on first use
+        print(f"Warning: Model warmup failed: {e}")
+
+
+@app.on_event("startup")
+async def warmup_models():
+    """Warm models in a background thread so startup completes without waiting for them."""
+    global _warmup_task
+    if not settings.warmup_models_on_startup:
+        return
+    _warmup_task = asyncio.create_task(asyncio.to_thread(_warmup))
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
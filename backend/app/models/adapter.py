@@ -1,21 +1,194 @@
 """Model adapter abstraction layer for flexible model inference."""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import os
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+import copy
+import functools
+import hashlib
+import importlib.util
+import asyncio
+import inspect
+import json
+import operator
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+import numpy as np
+import torch
+from transformers import (
+    pipeline,
+    AutoConfig,
+    AutoTokenizer,
+    AutoModelForSequenceClassification,
+    AutoModelForSeq2SeqLM,
+    AutoModelForTokenClassification,
+)
 try:
     from sentence_transformers import SentenceTransformer
 except ImportError as e:
     print(f"Warning: sentence-transformers import failed: {e}")
     SentenceTransformer = None
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from huggingface_hub import InferenceClient
 from app.config.settings import settings
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# vLLM is heavy to import, so only probe for it here and import on first use
+VLLM_AVAILABLE = importlib.util.find_spec("vllm") is not None
+
+
+def _json_dumps(payload: Any) -> bytes:
+    """Serialize a request payload to JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a JSON response body (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+_INFERENCE_CACHE_LOCK = threading.Lock()
+_EXECUTOR_LOCK = threading.Lock()
+
+# Normalizer for InferenceClient.summarization results, picked from the first response
+_SUMMARY_EXTRACTOR = None
+
+
+def _probe_summary_extractor(result):
+    """Pick how to read summary text from the InferenceClient's return type."""
+    # SummarizationOutput exposes summary_text as an attribute
+    if hasattr(result, 'summary_text'):
+        return operator.attrgetter('summary_text')
+    if isinstance(result, dict):
+        return lambda r: r.get("summary_text", "")
+    return str
+
+
+def _output_field(item, name: str):
+    """Read a field from an InferenceClient output element (plain dict on older hubs, dataclass on newer)."""
+    return item[name] if isinstance(item, dict) else getattr(item, name)
+
+
+def _cached_inference(method):
+    """Memoize an adapter method in a per-instance LRU keyed by text hash and call parameters."""
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, text, *args, **kwargs):
+        bound = signature.bind(self, text, *args, **kwargs)
+        bound.apply_defaults()
+        params = tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in bound.arguments.items()
+            if name not in ("self", "text")
+        )
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        key = (method.__name__, digest, params)
+        
+        with _INFERENCE_CACHE_LOCK:
+            cache = self.__dict__.setdefault("_inference_cache", OrderedDict())
+            if key in cache:
+                cache.move_to_end(key)
+                return copy.deepcopy(cache[key])
+        
+        result = method(self, text, *args, **kwargs)
+        
+        with _INFERENCE_CACHE_LOCK:
+            cache[key] = copy.deepcopy(result)
+            if len(cache) > self.INFERENCE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_device() -> Tuple[Any, str]:
+    """Best available device as (pipeline device, torch device string), detected once per process."""
+    if torch.cuda.is_available():
+        return 0, 'cuda'  # CUDA GPU
+    if hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+        return "mps", 'mps'  # Apple Silicon GPU
+    return -1, 'cpu'  # CPU fallback
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_dtype():
+    """Half-precision dtype for accelerators: BF16 on Ampere+ CUDA, FP16 otherwise, None on CPU."""
+    _, device_str = _detect_device()
+    if device_str == 'cpu':
+        return None
+    if device_str == 'cuda' and torch.cuda.get_device_capability(0)[0] >= 8:
+        return torch.bfloat16
+    return torch.float16
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_attention_implementation() -> str:
+    """Fused attention kernel: FlashAttention-2 on Ampere+ CUDA when installed, else PyTorch SDPA."""
+    if (
+        _detect_device()[1] == 'cuda'
+        and torch.cuda.get_device_capability(0)[0] >= 8
+        and importlib.util.find_spec("flash_attn") is not None
+    ):
+        return "flash_attention_2"
+    return "sdpa"
+
+
+def _get_shared_embedding_model(model_name: Optional[str] = None):
+    """Sentence transformer shared by every adapter and pipeline step (defaults to settings.embedding_model)."""
+    return _load_embedding_model(model_name or settings.embedding_model)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_embedding_model(model_name: str):
+    """Load a sentence transformer once per process and name, in half precision on GPU."""
+    if SentenceTransformer is None:
+        print("Warning: sentence-transformers not available, skipping embedding model")
+        return None
+    cache_dir = "./models_cache"
+    _, device = _detect_device()
+    
+    model = SentenceTransformer(
+        model_name,
+        cache_folder=cache_dir,
+        device=device
+    )
+    if device != 'cpu':
+        model.half()
+    model.eval()
+    # Cap sequence length to bound attention cost on long inputs
+    model.max_seq_length = min(model.max_seq_length, settings.embedding_max_seq_len)
+    return model
+
 
 class ModelAdapter(ABC):
     """Abstract base class for model adapters."""
     
+    # Max memoized summarize/extract_entities/classify results per adapter
+    INFERENCE_CACHE_SIZE = 512
+    
+    # Worker threads behind the async wrappers (forward passes release the GIL)
+    ASYNC_WORKERS = 1
+    
     @abstractmethod
     def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
         """Generate a summary of the input text."""
@@ -35,6 +208,35 @@ class ModelAdapter(ABC):
     def generate_structured(self, prompt: str, max_length: int = 500) -> str:
         """Generate structured output using a prompt (for JSON extraction, etc.)."""
         pass
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Bounded thread pool for running blocking inference off the event loop."""
+        with _EXECUTOR_LOCK:
+            executor = self.__dict__.get("_executor")
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.ASYNC_WORKERS,
+                    thread_name_prefix=type(self).__name__
+                )
+                self._executor = executor
+            return executor
+    
+    async def arun(self, func, *args, **kwargs):
+        """Run a blocking call on this adapter's thread pool and await the result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+    
+    async def asummarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
+        """Async variant of summarize."""
+        return await self.arun(self.summarize, text, max_length, min_length)
+    
+    async def aextract_entities(self, text: str) -> List[Dict[str, Any]]:
+        """Async variant of extract_entities."""
+        return await self.arun(self.extract_entities, text)
+    
+    async def aclassify(self, text: str, labels: List[str]) -> Dict[str, Any]:
+        """Async variant of classify."""
+        return await self.arun(self.classify, text, labels)
 
 
 class HuggingFaceInferenceAdapter(ModelAdapter):
@@ -50,7 +252,23 @@ class HuggingFaceInferenceAdapter(ModelAdapter):
         # Fallback to old API for compatibility
         self.api_url = "https://api-inference.huggingface.co/models"
         self.headers = {"Authorization": f"Bearer {token}"}
+        # Pooled keep-alive session so repeated calls reuse one TLS connection
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=None,  # POST inference calls are idempotent
+                raise_on_status=False  # Let raise_for_status surface the final status code
+            )
+        ))
+        self._session.headers.update(self.headers)
+        self._session.headers["Content-Type"] = "application/json"
     
+    @_cached_inference
     def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
         """Summarize text using HF Inference API with InferenceClient."""
         # Try the newer InferenceClient first (supports more models)
@@ -62,25 +280,15 @@ class HuggingFaceInferenceAdapter(ModelAdapter):
                 model=settings.summarization_model
             )
             
-            # InferenceClient returns a SummarizationOutput object with summary_text attribute
-            if hasattr(result, 'summary_text'):
-                summary = result.summary_text
-                if summary:
-                    return summary
-            
-            # Fallback: if it's a string
-            if isinstance(result, str):
-                return result
-            
-            # Fallback: if it's a dict
-            if isinstance(result, dict):
-                summary = result.get("summary_text", "")
+            # Return shape is fixed per huggingface_hub version, so probe it once
+            if result:
+                global _SUMMARY_EXTRACTOR
+                if _SUMMARY_EXTRACTOR is None:
+                    _SUMMARY_EXTRACTOR = _probe_summary_extractor(result)
+                summary = _SUMMARY_EXTRACTOR(result)
                 if summary:
                     return summary
             
-            if result:
-                return str(result)
-            
         except Exception as inference_err:
             error_msg = str(inference_err)
             error_type = type(inference_err).__name__
@@ -102,9 +310,9 @@ class HuggingFaceInferenceAdapter(ModelAdapter):
                     }
                 }
                 
-                response = requests.post(model_url, headers=self.headers, json=payload, timeout=60)
+                response = self._session.post(model_url, data=_json_dumps(payload), timeout=60)
                 response.raise_for_status()
-                result = response.json()
+                result = _json_loads(response.content)
                 
                 if isinstance(result, list) and len(result) > 0:
                     return result[0].get("summary_text", "")
@@ -135,6 +343,26 @@ class HuggingFaceInferenceAdapter(ModelAdapter):
         # If we get here, InferenceClient returned None or empty
         raise ValueError("InferenceClient returned empty result")
     
+    def analyze(self, text: str, labels: List[str], max_length: int = 150, min_length: int = 30) -> Dict[str, Any]:
+        """Run summarization, NER and classification concurrently for one text."""
+        # Remote calls are I/O-bound, so overlap the three round-trips
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            summary_future = pool.submit(self.summarize, text, max_length, min_length)
+            entities_future = pool.submit(self.extract_entities, text)
+            classification_future = pool.submit(self.classify, text, labels)
+            return {
+                "summary": summary_future.result(),
+                "entities": entities_future.result(),
+                "classification": classification_future.result()
+            }
+    
+    def summarize_batch(self, texts: List[str], max_length: int = 150, min_length: int = 30) -> List[str]:
+        """Summarize several texts with concurrent API calls, preserving input order."""
+        if not texts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(8, len(texts))) as pool:
+            return list(pool.map(lambda t: self.summarize(t, max_length, min_length), texts))
+    
     def generate_structured(self, prompt: str, max_length: int = 500) -> str:
         """Generate structured output using text generation (for JSON extraction, etc.)."""
         try:
@@ -159,35 +387,84 @@ class HuggingFaceInferenceAdapter(ModelAdapter):
         except:
             return ""
     
+    @_cached_inference
     def extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """Extract entities using HF Inference API."""
-        model_url = f"{self.api_url}/{settings.ner_model}"
-        payload = {"inputs": text}
-        
-        response = requests.post(model_url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if isinstance(result, list) and len(result) > 0:
-            return result[0]
-        return []
+        result = self.client.token_classification(
+            text,
+            model=settings.ner_model,
+            aggregation_strategy="simple"
+        )
+        # Drop unset fields so entries match the pipeline's aggregated output
+        return [{key: value for key, value in entity.items() if value is not None} for entity in result]
     
+    @_cached_inference
     def classify(self, text: str, labels: List[str]) -> Dict[str, Any]:
         """Classify text using HF Inference API."""
         # Use a zero-shot classification model
-        model_url = f"{self.api_url}/facebook/bart-large-mnli"
-        payload = {
-            "inputs": text,
-            "parameters": {"candidate_labels": labels}
+        result = self.client.zero_shot_classification(
+            text,
+            candidate_labels=labels,
+            model="facebook/bart-large-mnli"
+        )
+        ranked = sorted(result, key=lambda item: _output_field(item, "score"), reverse=True)
+        return {
+            "labels": [_output_field(item, "label") for item in ranked],
+            "scores": [_output_field(item, "score") for item in ranked]
         }
-        
-        response = requests.post(model_url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if isinstance(result, dict):
-            return result
-        return {"labels": [], "scores": []}
+
+
+class VLLMBackedSummarizer:
+    """vLLM summarization engine exposing the call interface of a transformers summarization pipeline."""
+    
+    SUMMARY_INSTRUCTION = (
+        "Summarize the following meeting transcript excerpt in a few sentences, "
+        "keeping decisions, action items and risks."
+    )
+    
+    def __init__(self, model_name: str):
+        # vLLM generates with decoder-only models; seq2seq summarizers (BART, T5) would be rejected or continued
+        if not self._is_decoder_only(model_name):
+            raise ValueError(f"{model_name} is not a decoder-only model")
+        from vllm import LLM, SamplingParams
+        self._sampling_params_cls = SamplingParams
+        self._llm = LLM(
+            model=model_name,
+            dtype=_detect_dtype() or "auto",
+            gpu_memory_utilization=0.6,
+            max_model_len=2048
+        )
+        self.tokenizer = self._llm.get_tokenizer()
+        # No transformers model behind this engine; summarize falls back to character chunking
+        self.model = None
+    
+    @staticmethod
+    def _is_decoder_only(model_name: str) -> bool:
+        """Whether the model's config describes a causal LM vLLM can serve."""
+        config = AutoConfig.from_pretrained(model_name, cache_dir="./models_cache")
+        if getattr(config, "is_encoder_decoder", False):
+            return False
+        return any(arch.endswith("ForCausalLM") for arch in (config.architectures or []))
+    
+    def _build_prompt(self, text: str) -> str:
+        """Wrap a transcript excerpt in a summarization instruction, via the chat template when present."""
+        request = f"{self.SUMMARY_INSTRUCTION}\n\n{text}"
+        if getattr(self.tokenizer, "chat_template", None):
+            return self.tokenizer.apply_chat_template(
+                [{"role": "user", "content": request}], tokenize=False, add_generation_prompt=True
+            )
+        return f"{request}\n\nSummary:"
+    
+    def __call__(self, inputs, max_length: int = 150, min_length: int = 30, do_sample: bool = False, **kwargs):
+        """Summarize one text or a list of texts in a single batched generate call."""
+        prompts = [self._build_prompt(text) for text in (inputs if isinstance(inputs, list) else [inputs])]
+        params = self._sampling_params_cls(
+            max_tokens=max_length,
+            min_tokens=min_length,
+            temperature=0.0
+        )
+        outputs = self._llm.generate(prompts, params, use_tqdm=False)
+        return [{"summary_text": output.outputs[0].text.strip()} for output in outputs]
 
 
 class LocalTransformerAdapter(ModelAdapter):
@@ -197,137 +474,305 @@ class LocalTransformerAdapter(ModelAdapter):
         self._summarizer = None
         self._ner_pipeline = None
         self._classifier = None
-        self._embedding_model = None
+        # Guards lazy pipeline loads when several threads hit a cold adapter
+        self._load_lock = threading.Lock()
+    
+    @staticmethod
+    def _max_input_chars(summarizer) -> int:
+        """Character window per summarization chunk, sized from the model's context length."""
+        config = getattr(getattr(summarizer, "model", None), "config", None)
+        max_positions = getattr(config, "max_position_embeddings", None)
+        if not max_positions:
+            return 1024
+        # ~3 chars per token keeps chunks inside the context for conversational text
+        return max_positions * 3
+    
+    @staticmethod
+    def _compile_model(model):
+        """Compile the model's forward with torch.compile on CUDA when enabled in settings."""
+        if not settings.compile_local_models:
+            return
+        version = tuple(int(part) for part in torch.__version__.split("+")[0].split(".")[:2])
+        if version < (2, 1) or _detect_device()[1] != 'cuda':
+            return
+        try:
+            # Compile forward in place so generate() also runs the compiled graph
+            model.forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=True)
+        except Exception as e:
+            print(f"Warning: torch.compile failed, keeping eager model: {e}")
+    
+    @staticmethod
+    def _inference_mode():
+        """Context manager disabling autograd tracking for pipeline forwards."""
+        return torch.inference_mode()
+    
+    @staticmethod
+    def _load_pipeline_model(model_cls, model_name: str, cache_dir: str):
+        """Load weights straight into their final device and dtype; INT8-quantize them on CPU."""
+        device, device_str = _detect_device()
+        accelerate_available = importlib.util.find_spec("accelerate") is not None
+        # Let accelerate place CUDA weights directly instead of loading on CPU first
+        place_on_load = device_str == 'cuda' and accelerate_available
+        
+        load_kwargs = {
+            "cache_dir": cache_dir,
+            "attn_implementation": _detect_attention_implementation()
+        }
+        if accelerate_available:
+            load_kwargs["low_cpu_mem_usage"] = True
+        if device_str != 'cpu':
+            load_kwargs["dtype"] = _detect_dtype()  # Use dtype instead of torch_dtype
+        if place_on_load:
+            load_kwargs["device_map"] = "auto"
+        model = model_cls.from_pretrained(model_name, **load_kwargs)
+        
+        if device_str == 'cpu':
+            try:
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            except Exception as e:
+                # No quantized engine on this platform - keep FP32 weights
+                print(f"Warning: INT8 quantization failed for {model_name}, using FP32: {e}")
+        
+        tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
+        # Models placed by accelerate must not be moved again by the pipeline
+        device_kwargs = {} if place_on_load else {"device": device}
+        return model, tokenizer, device_kwargs
     
     def _get_summarizer(self):
         """Lazy load summarization model with local caching."""
-        if self._summarizer is None:
+        if self._summarizer is not None:
+            return self._summarizer
+        with self._load_lock:
+            if self._summarizer is not None:
+                return self._summarizer
             # Cache models locally to avoid repeated downloads
             cache_dir = "./models_cache"
             
-            # Detect best available device
-            import torch
-            if torch.cuda.is_available():
-                device = 0  # CUDA GPU
-                print("[INFO] Using CUDA GPU for summarization")
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                device = "mps"  # Apple Silicon GPU
-                print("[INFO] Using Apple Silicon (MPS) GPU for summarization")
-            else:
-                device = -1  # CPU fallback
-                print("[INFO] Using CPU for summarization")
+            if settings.local_backend == "vllm":
+                if VLLM_AVAILABLE:
+                    try:
+                        self._summarizer = VLLMBackedSummarizer(settings.summarization_model)
+                        print("[INFO] Using vLLM backend for summarization")
+                        return self._summarizer
+                    except Exception as e:
+                        print(f"Warning: vLLM backend unavailable ({e}), falling back to transformers summarization")
+                else:
+                    print("Warning: vllm not installed, falling back to transformers summarization")
             
-            model_kwargs = {"cache_dir": cache_dir}
-            if device != -1:
-                model_kwargs["dtype"] = torch.float16  # Use dtype instead of torch_dtype
+            _, device_str = _detect_device()
+            device_names = {'cuda': "CUDA GPU", 'mps': "Apple Silicon (MPS) GPU", 'cpu': "CPU"}
+            print(f"[INFO] Using {device_names[device_str]} for summarization")
             
+            model, tokenizer, device_kwargs = self._load_pipeline_model(
+                AutoModelForSeq2SeqLM, settings.summarization_model, cache_dir
+            )
             self._summarizer = pipeline(
                 "summarization",
-                model=settings.summarization_model,
-                device=device,
-                model_kwargs=model_kwargs
+                model=model,
+                tokenizer=tokenizer,
+                batch_size=settings.summarization_batch_size,
+                **device_kwargs
             )
+            self._compile_model(self._summarizer.model)
         return self._summarizer
     
     def _get_ner_pipeline(self):
         """Lazy load NER pipeline with local caching."""
-        if self._ner_pipeline is None:
+        if self._ner_pipeline is not None:
+            return self._ner_pipeline
+        with self._load_lock:
+            if self._ner_pipeline is not None:
+                return self._ner_pipeline
             cache_dir = "./models_cache"
             
-            # Detect best available device
-            import torch
-            if torch.cuda.is_available():
-                device = 0  # CUDA GPU
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                device = "mps"  # Apple Silicon GPU
-            else:
-                device = -1  # CPU fallback
-            
+            model, tokenizer, device_kwargs = self._load_pipeline_model(
+                AutoModelForTokenClassification, settings.ner_model, cache_dir
+            )
             self._ner_pipeline = pipeline(
                 "ner",
-                model=settings.ner_model,
+                model=model,
+                tokenizer=tokenizer,
                 aggregation_strategy="simple",
-                device=device,
-                model_kwargs={"cache_dir": cache_dir}
+                batch_size=settings.ner_batch_size,
+                **device_kwargs
             )
+            self._compile_model(self._ner_pipeline.model)
         return self._ner_pipeline
     
+    @_cached_inference
     def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
         """Summarize text using local model."""
         summarizer = self._get_summarizer()
         
+        token_chunks = self._token_chunks(summarizer, text, max_length)
+        if token_chunks is not None:
+            input_tokens, chunks = token_chunks
+        else:
+            # No tokenizer on the pipeline - fall back to character windows
+            # Rough estimate: 1 token ≈ 4 characters
+            input_tokens = len(text) // 4
+            max_input_length = self._max_input_chars(summarizer)
+            chunks = [text[i:i+max_input_length] for i in range(0, len(text), max_input_length)]
+        
+        # Handle long text by summarizing each chunk
+        if len(chunks) > 1:
+            return " ".join(self._summarize_chunks(summarizer, chunks, min_length))
+        
         # Calculate dynamic max_length based on input length to avoid warnings
-        # Rough estimate: 1 token ≈ 4 characters
-        input_tokens = len(text) // 4
         # Ensure max_length is reasonable: at least min_length, but not more than input
         dynamic_max_length = max(min_length, min(max_length, max(min_length, input_tokens)))
         dynamic_min_length = min(min_length, dynamic_max_length - 1) if dynamic_max_length > min_length else min_length
         
-        # Handle long text by chunking if necessary
-        max_input_length = 1024
-        if len(text) > max_input_length:
-            # Simple chunking strategy
-            chunks = [text[i:i+max_input_length] for i in range(0, len(text), max_input_length)]
-            summaries = []
-            for chunk in chunks:
-                chunk_tokens = len(chunk) // 4
-                chunk_max = max(min_length, min(100, max(min_length, chunk_tokens)))
-                chunk_min = min(min_length, chunk_max - 1) if chunk_max > min_length else min_length
-                result = summarizer(chunk, max_length=chunk_max, min_length=chunk_min, do_sample=False)
-                summaries.append(result[0]["summary_text"])
-            return " ".join(summaries)
-        
-        result = summarizer(text, max_length=dynamic_max_length, min_length=dynamic_min_length, do_sample=False)
+        with self._inference_mode():
+            result = summarizer(text, max_length=dynamic_max_length, min_length=dynamic_min_length, do_sample=False)
         return result[0]["summary_text"]
     
+    def _token_chunks(self, summarizer, text: str, max_length: int):
+        """Split text into token windows that fit the model context, preferring sentence ends."""
+        tokenizer = getattr(summarizer, "tokenizer", None)
+        config = getattr(getattr(summarizer, "model", None), "config", None)
+        max_ctx = getattr(config, "max_position_embeddings", None)
+        if tokenizer is None or not max_ctx:
+            return None
+        
+        ids = tokenizer(text, add_special_tokens=False).input_ids
+        budget = max(max_ctx - max_length, max_ctx // 4)
+        if len(ids) <= budget:
+            return len(ids), [text]
+        
+        if getattr(self, "_sentence_end_ids", None) is None:
+            # Single-token encodings of sentence terminators, with and without a leading space
+            end_ids = set()
+            for mark in (".", "!", "?"):
+                for form in (mark, " " + mark):
+                    encoded = tokenizer(form, add_special_tokens=False).input_ids
+                    if len(encoded) == 1:
+                        end_ids.add(encoded[0])
+            self._sentence_end_ids = end_ids
+        end_ids = self._sentence_end_ids
+        
+        overlap = 64
+        chunks = []
+        start = 0
+        while start < len(ids):
+            end = min(start + budget, len(ids))
+            if end < len(ids):
+                # Pull the window back to the last sentence end in its second half
+                for j in range(end - 1, start + budget // 2, -1):
+                    if ids[j] in end_ids:
+                        end = j + 1
+                        break
+            chunks.append(tokenizer.decode(ids[start:end], skip_special_tokens=True))
+            if end >= len(ids):
+                break
+            # Start the next window inside the overlap, on a sentence boundary when possible
+            next_start = end - overlap
+            for j in range(end - overlap, end - 1):
+                if ids[j] in end_ids:
+                    next_start = j + 1
+                    break
+            start = max(next_start, start + 1)
+        return len(ids), chunks
+    
+    def _summarize_chunks(self, summarizer, chunks: List[str], min_length: int) -> Iterator[str]:
+        """Yield chunk summaries in order, batching consecutive chunks that share length limits."""
+        # Chunks of 400+ chars all cap at 100 tokens, so usually only a short tail differs
+        full_max = max(min_length, 100)
+        full_min = min(min_length, full_max - 1) if full_max > min_length else min_length
+        
+        def chunk_lengths(chunk: str) -> tuple:
+            chunk_tokens = len(chunk) // 4
+            if chunk_tokens >= 100:
+                return full_max, full_min
+            chunk_max = max(min_length, chunk_tokens)
+            return chunk_max, (min(min_length, chunk_max - 1) if chunk_max > min_length else min_length)
+        
+        for (chunk_max, chunk_min), group in groupby(chunks, key=chunk_lengths):
+            with self._inference_mode():
+                results = summarizer(list(group), max_length=chunk_max, min_length=chunk_min, do_sample=False)
+            yield from (result["summary_text"] for result in results)
+    
+    @_cached_inference
     def extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """Extract entities using local NER model."""
         ner_pipeline = self._get_ner_pipeline()
-        result = ner_pipeline(text)
+        with self._inference_mode():
+            result = ner_pipeline(text)
         return result if isinstance(result, list) else []
     
+    def extract_entities_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """Extract entities for several texts in batched NER forward passes."""
+        if not texts:
+            return []
+        ner_pipeline = self._get_ner_pipeline()
+        with self._inference_mode():
+            results = ner_pipeline(texts)
+        return [result if isinstance(result, list) else [] for result in results]
+    
+    @_cached_inference
     def classify(self, text: str, labels: List[str]) -> Dict[str, Any]:
         """Classify text using local model."""
         # For MVP, use a simple keyword-based classification
         # In production, this would use a fine-tuned classifier
+        if not labels:
+            return {"labels": [], "scores": []}
         text_lower = text.lower()
-        scores = {}
-        for label in labels:
+        lowered_labels, automaton = self._get_label_index(labels)
+        default_score = 0.3 / len(labels)
+        scores = np.empty(len(lowered_labels), dtype=np.float64)
+        if automaton is not None:
+            # One pass over the text finds every label mentioned in it
+            hits = {label for _, label in automaton.iter(text_lower)}
+            hits.add("")
+            for i, (_, low) in enumerate(lowered_labels):
+                scores[i] = 0.7 if low in hits else default_score
+        else:
             # Simple keyword matching as fallback
-            if label.lower() in text_lower:
-                scores[label] = 0.7
-            else:
-                scores[label] = 0.3 / len(labels)
+            for i, (_, low) in enumerate(lowered_labels):
+                scores[i] = 0.7 if low in text_lower else default_score
         
-        sorted_labels = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        # Stable sort keeps label order among equal scores
+        order = np.argsort(-scores, kind="stable")
         return {
-            "labels": [label for label, _ in sorted_labels],
-            "scores": [score for _, score in sorted_labels]
+            "labels": [lowered_labels[i][0] for i in order],
+            "scores": scores[order].tolist()
         }
     
-    def get_embedding_model(self):
-        """Get sentence transformer for embeddings with local caching."""
-        if not hasattr(self, '_embedding_model') or self._embedding_model is None:
-            cache_dir = "./models_cache"
-            # Detect best available device
-            import torch
-            if torch.cuda.is_available():
-                device = 'cuda'
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                device = 'mps'  # Apple Silicon GPU
+    def _get_label_index(self, labels: List[str]):
+        """(label, lowered label) pairs and Aho-Corasick automaton, rebuilt only when the labels change."""
+        key = tuple(labels)
+        cached = getattr(self, "_label_index", None)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        
+        # Duplicate labels collapse to one entry, keeping first-seen order
+        lowered_labels = [(label, label.lower()) for label in dict.fromkeys(labels)]
+        automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for _, low in lowered_labels:
+                # Empty labels match everywhere; classify treats them as hits directly
+                if low:
+                    automaton.add_word(low, low)
+            if len(automaton):
+                automaton.make_automaton()
             else:
-                device = 'cpu'
-            
-            if SentenceTransformer is None:
-                print("Warning: sentence-transformers not available, skipping embedding model")
-                self._embedding_model = None
-                return None
-            self._embedding_model = SentenceTransformer(
-                settings.embedding_model,
-                cache_folder=cache_dir,
-                device=device
-            )
-        return self._embedding_model
+                automaton = None
+        self._label_index = (key, lowered_labels, automaton)
+        return lowered_labels, automaton
+    
+    def get_embedding_model(self):
+        """Get the shared sentence transformer for embeddings."""
+        return _get_shared_embedding_model()
+    
+    def warmup(self):
+        """Load local models and run a tiny forward pass so first requests hit warm kernels."""
+        with self._inference_mode():
+            self._get_summarizer()("Warmup run for the summarization model.", max_length=5, min_length=1, do_sample=False)
+            self._get_ner_pipeline()("warmup")
+        embedding_model = self.get_embedding_model()
+        if embedding_model is not None:
+            embedding_model.encode(["warmup"])
     
     def generate_structured(self, prompt: str, max_length: int = 500) -> str:
         """Generate structured output using text generation."""
@@ -347,7 +792,8 @@ class HybridAdapter(ModelAdapter):
     
     def __init__(self, token: str):
         self.hf_adapter = HuggingFaceInferenceAdapter(token)
-        self.local_adapter = LocalTransformerAdapter()
+        # Share the process-wide local adapter so its models load once
+        self.local_adapter = get_model_adapter("local")
     
     def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
         """Use HF API for summarization, fallback to local if API fails."""
@@ -368,28 +814,12 @@ class HybridAdapter(ModelAdapter):
         return self.local_adapter.classify(text, labels)
     
     def get_embedding_model(self):
-        """Get sentence transformer for embeddings with local caching."""
-        if not hasattr(self, '_embedding_model') or self._embedding_model is None:
-            cache_dir = "./models_cache"
-            # Detect best available device
-            import torch
-            if torch.cuda.is_available():
-                device = 'cuda'
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                device = 'mps'  # Apple Silicon GPU
-            else:
-                device = 'cpu'
-            
-            if SentenceTransformer is None:
-                print("Warning: sentence-transformers not available, skipping embedding model")
-                self._embedding_model = None
-                return None
-            self._embedding_model = SentenceTransformer(
-                settings.embedding_model,
-                cache_folder=cache_dir,
-                device=device
-            )
-        return self._embedding_model
+        """Get the shared sentence transformer for embeddings."""
+        return _get_shared_embedding_model()
+    
+    def warmup(self):
+        """Warm the local models used for extraction and summarization fallback."""
+        self.local_adapter.warmup()
     
     def generate_structured(self, prompt: str, max_length: int = 500) -> str:
         """Generate structured output - use HF API first, fallback to local."""
@@ -405,7 +835,12 @@ def get_model_adapter(strategy: Optional[str] = None) -> ModelAdapter:
         strategy = settings.model_strategy.lower()
     else:
         strategy = strategy.lower()
-    
+    return _adapter_for(strategy)
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter_for(strategy: str) -> ModelAdapter:
+    """Build one process-wide adapter per strategy so loaded models are shared."""
     if strategy == "local":
         return LocalTransformerAdapter()
     elif strategy == "remote":
@@ -1,27 +1,105 @@
 """Speaker diarization models for identifying who spoke when."""
+import functools
+import json
 import logging
 import re
-from typing import List, Dict, Any, Tuple, Optional, Union
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple, Optional, Set, Union
 from pathlib import Path
 import numpy as np
+from app.config.settings import settings
 from app.preprocessing.parser import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_timestamp_cached(timestamp: str) -> Optional[float]:
+    """Parse a timestamp string to seconds, memoized across segments and passes."""
+    # Handle formats: "1:23", "0:03", "1:23:45"
+    try:
+        parts = timestamp.split(':')
+        if len(parts) == 2:  # MM:SS
+            minutes, seconds = map(int, parts)
+            return minutes * 60 + seconds
+        elif len(parts) == 3:  # HH:MM:SS
+            hours, minutes, seconds = map(int, parts)
+            return hours * 3600 + minutes * 60 + seconds
+        else:
+            return float(timestamp)  # Assume seconds
+    except ValueError:
+        logger.warning(f"Could not parse timestamp: {timestamp}")
+        return None
+
+
+_INITIAL_RE = re.compile(r'\b[A-Z]\.\s*')
+_TITLE_RE = re.compile(r'\b(Dr|Mr|Ms|Mrs)\.\s*', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_speaker_name_cached(name: str) -> str:
+    """Normalize a speaker name, memoized since the same speakers recur across transcripts."""
+    # Remove extra whitespace
+    name = ' '.join(name.split())
+    
+    # Handle "Last, First" format
+    if ',' in name:
+        parts = name.split(',')
+        if len(parts) == 2:
+            last, first = [p.strip() for p in parts]
+            return f"{first} {last}"
+    
+    # Handle initials and titles
+    name = _INITIAL_RE.sub('', name)  # Remove initials like "J. "
+    name = _TITLE_RE.sub('', name)  # Remove titles
+    
+    return name.strip()
+
+
+@dataclass
+class SeriesSpeakers:
+    """Speaker embeddings of one diarization, to fold into its meeting series' centroids after name resolution."""
+    series_id: str
+    # Speaker label (the cached name when matched) -> embedding
+    embeddings: Dict[str, np.ndarray] = field(default_factory=dict)
+    # Turns per speaker label, weighting each embedding in the centroid update
+    turns: Counter = field(default_factory=Counter)
+    # Labels already named from the series cache
+    matched: Set[str] = field(default_factory=set)
+
+
 class PyAnnoteDiarizer:
     """PyAnnote-based speaker diarization with calendar integration."""
     
-    def __init__(self, model_name: str = "pyannote/speaker-diarization-3.1", auth_token: Optional[str] = None):
+    # Loaded pipelines shared across instances, keyed by model name
+    _pipeline_cache: Dict[str, Any] = {}
+    
+    def __init__(
+        self,
+        model_name: str = "pyannote/speaker-diarization-3.1",
+        auth_token: Optional[str] = None,
+        speaker_cache_dir: Optional[str] = None,
+        cache_threshold: float = 0.3
+    ):
         """Initialize PyAnnote diarizer.
         
         Args:
             model_name: HuggingFace model name
             auth_token: HuggingFace auth token for gated models
+            speaker_cache_dir: Directory persisting speaker centroids per meeting series
+            cache_threshold: Max cosine distance for matching a speaker to a cached centroid
         """
         self.model_name = model_name
         self.pipeline = None
         self.auth_token = auth_token
+        self.speaker_cache_dir = speaker_cache_dir or settings.speaker_cache_dir
+        self.cache_threshold = cache_threshold
+        # Meeting series -> speaker name -> (embedding centroid, turn count)
+        self._speaker_cache: Dict[str, Dict[str, Tuple[np.ndarray, int]]] = {}
+        # The diarizer is shared across jobs; guards the centroid cache and its files
+        self._speaker_cache_lock = threading.Lock()
         self._load_model()
     
     def _load_model(self):
@@ -29,13 +107,15 @@ class PyAnnoteDiarizer:
         try:
             from pyannote.audio import Pipeline
             
-            if self.auth_token:
-                self.pipeline = Pipeline.from_pretrained(
-                    self.model_name, 
-                    use_auth_token=self.auth_token
-                )
-            else:
-                self.pipeline = Pipeline.from_pretrained(self.model_name)
+            if self.model_name not in self._pipeline_cache:
+                if self.auth_token:
+                    self._pipeline_cache[self.model_name] = Pipeline.from_pretrained(
+                        self.model_name, 
+                        use_auth_token=self.auth_token
+                    )
+                else:
+                    self._pipeline_cache[self.model_name] = Pipeline.from_pretrained(self.model_name)
+            self.pipeline = self._pipeline_cache[self.model_name]
             
             logger.info(f"Loaded PyAnnote diarization model: {self.model_name}")
             
@@ -55,12 +135,40 @@ class PyAnnoteDiarizer:
         Returns:
             List of (start_time, end_time, speaker_id) tuples
         """
+        return self._diarize(audio_path)[0]
+    
+    def diarize_series(
+        self, 
+        audio_path: str, 
+        series_id: str
+    ) -> Tuple[List[Tuple[float, float, str]], Optional[SeriesSpeakers]]:
+        """Diarize a recurring meeting; speakers matching the series' cached centroids keep their names.
+        
+        Args:
+            audio_path: Path to audio file
+            series_id: Recurring meeting series
+            
+        Returns:
+            (start_time, end_time, speaker_id) tuples, and the speaker embeddings to pass to
+            resolve_speaker_names (None if diarization failed)
+        """
+        return self._diarize(audio_path, str(series_id))
+    
+    def _diarize(
+        self, 
+        audio_path: str, 
+        series_id: Optional[str] = None
+    ) -> Tuple[List[Tuple[float, float, str]], Optional[SeriesSpeakers]]:
+        """Run the pipeline, matching speakers against the series cache when a series is given."""
         if not self.pipeline:
             raise RuntimeError("Diarization pipeline not loaded")
         
         try:
-            # Apply diarization
-            diarization = self.pipeline(audio_path)
+            # Apply diarization (speaker embeddings are only needed for the series cache)
+            if series_id:
+                diarization, embeddings = self.pipeline(audio_path, return_embeddings=True)
+            else:
+                diarization = self.pipeline(audio_path)
             
             # Convert to segments
             segments = []
@@ -71,12 +179,129 @@ class PyAnnoteDiarizer:
                     speaker
                 ))
             
+            series_speakers = None
+            if series_id:
+                segments, series_speakers = self._apply_speaker_cache(
+                    series_id, segments, diarization.labels(), embeddings
+                )
+            
             logger.info(f"Diarization found {len(segments)} speaker segments")
-            return segments
+            return segments, series_speakers
             
         except Exception as e:
             logger.error(f"Diarization failed: {e}")
-            return []
+            return [], None
+    
+    def _apply_speaker_cache(
+        self, 
+        series_id: str, 
+        segments: List[Tuple[float, float, str]], 
+        labels: List[str], 
+        embeddings: np.ndarray
+    ) -> Tuple[List[Tuple[float, float, str]], SeriesSpeakers]:
+        """Relabel speakers whose embeddings match cached centroids of the meeting series."""
+        label_embeddings = {
+            label: np.asarray(embeddings[i], dtype=np.float32)
+            for i, label in enumerate(labels)
+            if i < len(embeddings) and np.all(np.isfinite(embeddings[i]))
+        }
+        with self._speaker_cache_lock:
+            cache = dict(self._load_speaker_cache(series_id))
+        
+        mapping: Dict[str, str] = {}
+        if cache and label_embeddings:
+            names = list(cache)
+            label_list = list(label_embeddings)
+            centroids = np.stack([cache[name][0] for name in names])
+            vectors = np.stack([label_embeddings[label] for label in label_list])
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            distances = 1.0 - vectors @ centroids.T
+            
+            # One-to-one assignment, closest pairs first
+            taken = set()
+            for flat in np.argsort(distances, axis=None, kind='stable').tolist():
+                i, j = divmod(flat, len(names))
+                if distances[i, j] >= self.cache_threshold:
+                    break
+                if label_list[i] in mapping or names[j] in taken:
+                    continue
+                mapping[label_list[i]] = names[j]
+                taken.add(names[j])
+            if mapping:
+                logger.info(f"Matched {len(mapping)} cached speakers for meeting series {series_id}")
+        
+        segments = [(start, end, mapping.get(speaker, speaker)) for start, end, speaker in segments]
+        return segments, SeriesSpeakers(
+            series_id=series_id,
+            embeddings={mapping.get(label, label): vector for label, vector in label_embeddings.items()},
+            turns=Counter(speaker for _, _, speaker in segments),
+            matched=set(mapping.values())
+        )
+    
+    def _update_speaker_cache(self, series_speakers: SeriesSpeakers, names: Dict[str, str]):
+        """Fold a diarization's speaker embeddings into the series centroids.
+        
+        Args:
+            series_speakers: Embeddings returned by diarize_series
+            names: Speaker label -> participant name, for speakers identified as real participants only
+        """
+        with self._speaker_cache_lock:
+            cache = self._load_speaker_cache(series_speakers.series_id)
+            for speaker_id, embedding in series_speakers.embeddings.items():
+                name = names.get(speaker_id)
+                if name is None:
+                    continue
+                turns = series_speakers.turns.get(speaker_id, 0) or 1
+                if name in cache:
+                    centroid, cached_turns = cache[name]
+                    cache[name] = (
+                        (cached_turns * centroid + turns * embedding) / (cached_turns + turns),
+                        cached_turns + turns
+                    )
+                else:
+                    cache[name] = (embedding, turns)
+            self._save_speaker_cache(series_speakers.series_id)
+    
+    def _speaker_cache_path(self, series_id: str) -> Optional[Path]:
+        """File persisting the centroids of a meeting series, if persistence is configured."""
+        if not self.speaker_cache_dir:
+            return None
+        return Path(self.speaker_cache_dir) / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', series_id)}.json"
+    
+    def _load_speaker_cache(self, series_id: str) -> Dict[str, Tuple[np.ndarray, int]]:
+        """Get the cached centroids of a meeting series, reading them from disk on first use."""
+        if series_id not in self._speaker_cache:
+            cache = {}
+            path = self._speaker_cache_path(series_id)
+            if path and path.exists():
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    cache = {
+                        name: (np.asarray(entry['centroid'], dtype=np.float32), int(entry['count']))
+                        for name, entry in data.items()
+                    }
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Could not read speaker cache {path}: {e}")
+            self._speaker_cache[series_id] = cache
+        return self._speaker_cache[series_id]
+    
+    def _save_speaker_cache(self, series_id: str):
+        """Persist the centroids of a meeting series when a cache directory is configured."""
+        path = self._speaker_cache_path(series_id)
+        if path is None:
+            return
+        data = {
+            name: {'centroid': centroid.tolist(), 'count': count}
+            for name, (centroid, count) in self._speaker_cache.get(series_id, {}).items()
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            logger.warning(f"Could not write speaker cache {path}: {e}")
     
     def assign_speakers_to_segments(
         self, 
@@ -92,20 +317,18 @@ class PyAnnoteDiarizer:
         Returns:
             Segments with updated speaker information
         """
-        updated_segments = []
+        # Nothing to align without diarization output or any timestamped segment
+        if not diarization_segments or not any(segment.timestamp for segment in segments):
+            return list(segments)
         
-        for segment in segments:
-            # Try to parse timestamp to get start time
-            start_time = self._parse_timestamp(segment.timestamp)
-            
+        # Try to parse timestamps to get start times
+        start_times = [self._parse_timestamp(segment.timestamp) for segment in segments]
+        speaker_ids = self._find_speakers_at_times(start_times, diarization_segments)
+        
+        updated_segments = []
+        for segment, start_time, speaker_id in zip(segments, start_times, speaker_ids):
             if start_time is not None:
-                # Find matching diarization segment
-                speaker_id = self._find_speaker_at_time(start_time, diarization_segments)
-                updated_segment = TranscriptSegment(
-                    text=segment.text,
-                    speaker=speaker_id or segment.speaker,
-                    timestamp=segment.timestamp
-                )
+                updated_segment = segment.with_speaker(speaker_id or segment.speaker)
             else:
                 updated_segment = segment
             
@@ -116,13 +339,15 @@ class PyAnnoteDiarizer:
     def resolve_speaker_names(
         self, 
         segments: List[TranscriptSegment], 
-        calendar_metadata: Dict[str, Any]
+        calendar_metadata: Dict[str, Any],
+        series_speakers: Optional[SeriesSpeakers] = None
     ) -> List[TranscriptSegment]:
         """Resolve speaker IDs to actual names using calendar data.
         
         Args:
             segments: Segments with speaker IDs
             calendar_metadata: Meeting metadata with participant names
+            series_speakers: Embeddings from diarize_series; participants identified here update the series cache
             
         Returns:
             Segments with resolved speaker names
@@ -132,56 +357,69 @@ class PyAnnoteDiarizer:
             logger.warning("No participant names in calendar metadata")
             return segments
         
+        # Speakers matched to the series cache are already named; map the rest to remaining participants
+        resolved = series_speakers.matched if series_speakers else set()
+        
         # Build speaker ID to name mapping
-        speaker_mapping = self._build_speaker_mapping(segments, participants)
+        speaker_mapping = self._build_speaker_mapping(
+            [segment for segment in segments if segment.speaker not in resolved] if resolved else segments,
+            [name for name in participants if name not in resolved] if resolved else participants
+        )
         
         # Apply mapping
         resolved_segments = []
         for segment in segments:
-            if segment.speaker and segment.speaker in speaker_mapping:
-                resolved_name = speaker_mapping[segment.speaker]
-                resolved_segment = TranscriptSegment(
-                    text=segment.text,
-                    speaker=resolved_name,
-                    timestamp=segment.timestamp
-                )
+            resolved_name = speaker_mapping.get(segment.speaker) if segment.speaker else None
+            if resolved_name is not None:
+                resolved_segment = segment.with_speaker(resolved_name)
             else:
                 resolved_segment = segment
             
             resolved_segments.append(resolved_segment)
         
+        if series_speakers and series_speakers.embeddings:
+            # Only cached names and real participants become identities, never Speaker_N guesses or raw labels
+            participant_names = set(participants)
+            names = {label: label for label in series_speakers.embeddings if label in resolved}
+            for label in series_speakers.embeddings:
+                if speaker_mapping.get(label) in participant_names:
+                    names[label] = speaker_mapping[label]
+            self._update_speaker_cache(series_speakers, names)
+        
         return resolved_segments
     
     def _parse_timestamp(self, timestamp: Optional[str]) -> Optional[float]:
         """Parse timestamp string to seconds."""
         if not timestamp:
             return None
-        
-        # Handle formats: "1:23", "0:03", "1:23:45"
-        try:
-            parts = timestamp.split(':')
-            if len(parts) == 2:  # MM:SS
-                minutes, seconds = map(int, parts)
-                return minutes * 60 + seconds
-            elif len(parts) == 3:  # HH:MM:SS
-                hours, minutes, seconds = map(int, parts)
-                return hours * 3600 + minutes * 60 + seconds
-            else:
-                return float(timestamp)  # Assume seconds
-        except ValueError:
-            logger.warning(f"Could not parse timestamp: {timestamp}")
-            return None
+        return _parse_timestamp_cached(timestamp)
     
-    def _find_speaker_at_time(
+    def _find_speakers_at_times(
         self, 
-        time: float, 
+        times: List[Optional[float]], 
         diarization_segments: List[Tuple[float, float, str]]
-    ) -> Optional[str]:
-        """Find which speaker was active at a given time."""
-        for start, end, speaker in diarization_segments:
-            if start <= time <= end:
-                return speaker
-        return None
+    ) -> List[Optional[str]]:
+        """Find which speaker was active at each given time."""
+        found: List[Optional[str]] = [None] * len(times)
+        timed = [i for i, time in enumerate(times) if time is not None]
+        if not timed or not diarization_segments:
+            return found
+        
+        # Sort by start and keep a running max of ends: the first segment covering t is the
+        # first one whose running max end reaches t, provided it started by t
+        order = sorted(range(len(diarization_segments)), key=lambda i: diarization_segments[i][0])
+        starts = np.fromiter((diarization_segments[i][0] for i in order), dtype=float, count=len(order))
+        ends = np.fromiter((diarization_segments[i][1] for i in order), dtype=float, count=len(order))
+        max_ends = np.maximum.accumulate(ends)
+        
+        query = np.fromiter((times[i] for i in timed), dtype=float, count=len(timed))
+        last_started = np.searchsorted(starts, query, side='right') - 1
+        first_active = np.searchsorted(max_ends, query, side='left')
+        
+        for i, hit, index in zip(timed, (first_active <= last_started).tolist(), first_active.tolist()):
+            if hit:
+                found[i] = diarization_segments[order[index]][2]
+        return found
     
     def _build_speaker_mapping(
         self, 
@@ -196,21 +434,17 @@ class PyAnnoteDiarizer:
         - Text analysis for name mentions
         """
         # Count speaker frequencies
-        speaker_counts = {}
-        for segment in segments:
-            if segment.speaker:
-                speaker_counts[segment.speaker] = speaker_counts.get(segment.speaker, 0) + 1
+        speaker_counts = Counter(segment.speaker for segment in segments if segment.speaker)
         
-        # Sort speakers by frequency (most active first)
-        sorted_speakers = sorted(speaker_counts.keys(), key=lambda s: speaker_counts[s], reverse=True)
+        # Sort speakers by frequency (most active first, ties in order of appearance)
+        sorted_speakers = [speaker for speaker, _ in speaker_counts.most_common()]
         
         # Simple mapping: most frequent speakers -> first participants
-        mapping = {}
-        for i, speaker_id in enumerate(sorted_speakers):
-            if i < len(participants):
-                mapping[speaker_id] = participants[i]
-            else:
-                mapping[speaker_id] = f"Speaker_{i+1}"
+        mapping = dict(zip(sorted_speakers, participants))
+        mapping.update(
+            (speaker_id, f"Speaker_{i+1}")
+            for i, speaker_id in enumerate(sorted_speakers[len(participants):], start=len(participants))
+        )
         
         logger.info(f"Built speaker mapping: {mapping}")
         return mapping
@@ -226,6 +460,14 @@ class SimpleDiarizer:
             r'^\[([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\]',  # "[John Doe]"
             r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(\d+:\d+)',  # "John Doe 1:23"
         ]
+        # One anchored alternation over all patterns; map each group to its pattern's speaker group
+        self._speaker_group = {}
+        group = 1
+        for pattern in self.speaker_patterns:
+            width = re.compile(pattern).groups
+            self._speaker_group.update((group + offset, group) for offset in range(width))
+            group += width
+        self._speaker_union = re.compile('|'.join(f'(?:{pattern})' for pattern in self.speaker_patterns))
     
     def diarize_text(self, text: str) -> List[TranscriptSegment]:
         """Extract speakers from formatted text transcript.
@@ -236,7 +478,7 @@ class SimpleDiarizer:
         Returns:
             List of segments with speaker information
         """
-        lines = text.split('\n')
+        lines = text.splitlines()
         segments = []
         current_speaker = None
         current_text = []
@@ -247,9 +489,10 @@ class SimpleDiarizer:
                 continue
             
             # Try to detect speaker
-            speaker = self._extract_speaker(line)
+            extracted = self._extract_speaker(line)
             
-            if speaker:
+            if extracted:
+                speaker, prefix_end = extracted
                 # Save previous segment
                 if current_text and current_speaker:
                     segments.append(TranscriptSegment(
@@ -260,13 +503,12 @@ class SimpleDiarizer:
                 
                 # Start new segment
                 current_speaker = speaker
-                # Remove speaker prefix from text
-                clean_text = self._remove_speaker_prefix(line)
+                # Slice off the matched speaker prefix
+                clean_text = line[prefix_end:].lstrip(': \t').strip()
                 current_text = [clean_text] if clean_text else []
-            else:
-                # Continue current segment
-                if line:
-                    current_text.append(line)
+            elif current_speaker:
+                # Continue current segment (text before the first speaker is never emitted)
+                current_text.append(line)
         
         # Save final segment
         if current_text and current_speaker:
@@ -278,19 +520,16 @@ class SimpleDiarizer:
         
         return segments
     
-    def _extract_speaker(self, line: str) -> Optional[str]:
-        """Extract speaker name from line."""
-        for pattern in self.speaker_patterns:
-            match = re.match(pattern, line)
-            if match:
-                return match.group(1).strip()
-        return None
-    
-    def _remove_speaker_prefix(self, line: str) -> str:
-        """Remove speaker prefix from line."""
-        for pattern in self.speaker_patterns:
-            line = re.sub(pattern, '', line).strip()
-        return line.lstrip(':').strip()
+    def _extract_speaker(self, line: str) -> Optional[Tuple[str, int]]:
+        """Extract speaker name and the end offset of its prefix from line."""
+        # Speaker prefixes start with an ASCII capital or "[", so skip the regex otherwise
+        first = line[:1]
+        if not ('A' <= first <= 'Z' or first == '['):
+            return None
+        match = self._speaker_union.match(line)
+        if match is None:
+            return None
+        return match.group(self._speaker_group[match.lastindex]).strip(), match.end()
     
     def normalize_speakers(self, segments: List[TranscriptSegment]) -> List[TranscriptSegment]:
         """Normalize speaker names to consistent format."""
@@ -308,11 +547,7 @@ class SimpleDiarizer:
         for segment in segments:
             if segment.speaker:
                 normalized_speaker = speaker_variants.get(segment.speaker, segment.speaker)
-                normalized_segments.append(TranscriptSegment(
-                    text=segment.text,
-                    speaker=normalized_speaker,
-                    timestamp=segment.timestamp
-                ))
+                normalized_segments.append(segment.with_speaker(normalized_speaker))
             else:
                 normalized_segments.append(segment)
         
@@ -322,22 +557,7 @@ class SimpleDiarizer:
         """Normalize speaker name to consistent format."""
         if not name:
             return name
-        
-        # Remove extra whitespace
-        name = ' '.join(name.split())
-        
-        # Handle "Last, First" format
-        if ',' in name:
-            parts = name.split(',')
-            if len(parts) == 2:
-                last, first = [p.strip() for p in parts]
-                return f"{first} {last}"
-        
-        # Handle initials and titles
-        name = re.sub(r'\b[A-Z]\.\s*', '', name)  # Remove initials like "J. "
-        name = re.sub(r'\b(Dr|Mr|Ms|Mrs)\.\s*', '', name, flags=re.IGNORECASE)  # Remove titles
-        
-        return name.strip()
+        return _normalize_speaker_name_cached(name)
 
 
 def get_diarizer(provider: str = "simple", **kwargs) -> Union[PyAnnoteDiarizer, SimpleDiarizer]:
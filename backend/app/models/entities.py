@@ -1,11 +1,21 @@
 """Entity recognition models for extracting structured information from meeting transcripts."""
 import re
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+import threading
+from operator import attrgetter
+from typing import List, Dict, Any, Tuple, Optional, Set
 from dataclasses import dataclass
+from app.preprocessing.parser import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
+# Hyperscan checks every label's patterns in one pass over the text
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 
 @dataclass
 class Entity:
@@ -20,6 +30,19 @@ class Entity:
 class RuleBasedNER:
     """Rule-based Named Entity Recognition for meeting contexts."""
     
+    # Direct assignment patterns for action owners
+    _ASSIGNMENT_PATTERNS = [
+        re.compile(pattern, re.IGNORECASE)
+        for pattern in (
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+will\s+',
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+to\s+(?:handle|complete|do|work on)',
+            r'assign(?:ed)?\s+to\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:is\s+)?responsible\s+for',
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+should\s+',
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+can\s+(?:you\s+)?(?:please\s+)?'
+        )
+    ]
+    
     def __init__(self):
         self.patterns = {
             'PERSON': [
@@ -66,22 +89,74 @@ class RuleBasedNER:
             r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),?\s+(?:our\s+)?(?:CEO|CTO|VP|director|manager|lead)\b',
             r'\b(?:CEO|CTO|VP|director|manager|lead)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b'
         ]
+        
+        # One alternation per label so extraction scans the text once per label;
+        # labels stay separate so overlaps across labels still reach _remove_overlaps
+        self._compiled = [
+            (label, re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE))
+            for label, patterns in self.patterns.items()
+        ]
+        self._role_compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.role_patterns]
+        self._hs_database = self._build_hyperscan_database() if HYPERSCAN_AVAILABLE else None
+        # Concurrent scans need their own scratch space; one per thread avoids locking
+        self._hs_local = threading.local()
+    
+    def _build_hyperscan_database(self):
+        """Compile every label's union into one Hyperscan database, or None if it fails."""
+        flags = (
+            hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+            | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+        )
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.pattern.encode('utf-8') for _, pattern in self._compiled],
+                ids=list(range(len(self._compiled))),
+                elements=len(self._compiled),
+                flags=[flags] * len(self._compiled)
+            )
+            return database
+        except Exception as e:
+            logger.warning(f"Hyperscan compilation failed, using re for all labels: {e}")
+            return None
+    
+    def _labels_to_scan(self, text: str) -> Optional[Set[int]]:
+        """Indices of labels that may match text, or None when every label must be scanned."""
+        if self._hs_database is None:
+            return None
+        try:
+            data = text.encode('utf-8')
+        except UnicodeEncodeError:
+            return None
+        
+        hits: Set[int] = set()
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(pattern_id)
+        
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_database)
+        self._hs_database.scan(data, match_event_handler=on_match, scratch=scratch)
+        return hits
     
     def extract_entities(self, text: str) -> List[Entity]:
         """Extract entities from text using rule-based patterns."""
         entities = []
         
-        for label, patterns in self.patterns.items():
-            for pattern in patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    entity = Entity(
-                        text=match.group().strip(),
-                        label=label,
-                        start=match.start(),
-                        end=match.end(),
-                        confidence=0.8
-                    )
-                    entities.append(entity)
+        # Prefilter mode only reports candidates, so re still produces the actual matches
+        candidates = self._labels_to_scan(text)
+        for index, (label, pattern) in enumerate(self._compiled):
+            if candidates is not None and index not in candidates:
+                continue
+            for match in pattern.finditer(text):
+                entity = Entity(
+                    text=match.group().strip(),
+                    label=label,
+                    start=match.start(),
+                    end=match.end(),
+                    confidence=0.8
+                )
+                entities.append(entity)
         
         # Extract people with roles
         entities.extend(self._extract_people_with_roles(text))
@@ -95,8 +170,8 @@ class RuleBasedNER:
         """Extract people mentioned with their roles."""
         entities = []
         
-        for pattern in self.role_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for pattern in self._role_compiled:
+            for match in pattern.finditer(text):
                 name = match.group(1).strip()
                 entity = Entity(
                     text=name,
@@ -111,52 +186,53 @@ class RuleBasedNER:
     
     def _remove_overlaps(self, entities: List[Entity]) -> List[Entity]:
         """Remove overlapping entities, keeping the one with highest confidence."""
-        entities.sort(key=lambda x: x.start)
+        entities.sort(key=attrgetter('start'))
         filtered = []
         
+        # Kept entities are disjoint and sorted by start, so only the last one can overlap
         for entity in entities:
-            overlap = False
-            for existing in filtered:
-                if (entity.start < existing.end and entity.end > existing.start):
-                    if entity.confidence > existing.confidence:
-                        filtered.remove(existing)
-                    else:
-                        overlap = True
-                        break
-            
-            if not overlap:
-                filtered.append(entity)
+            if filtered:
+                last = filtered[-1]
+                if entity.start < last.end and entity.end > last.start:
+                    if entity.confidence > last.confidence:
+                        filtered[-1] = entity
+                    continue
+            filtered.append(entity)
         
         return filtered
     
     def extract_action_owners(self, text: str) -> List[str]:
         """Extract potential action item owners from text."""
-        owners = []
-        
-        # Direct assignment patterns
-        assignment_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+will\s+',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+to\s+(?:handle|complete|do|work on)',
-            r'assign(?:ed)?\s+to\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:is\s+)?responsible\s+for',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+should\s+',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+can\s+(?:you\s+)?(?:please\s+)?'
-        ]
+        # Dict keys dedupe in O(1) while keeping first-seen order
+        owners: Dict[str, None] = {}
         
-        for pattern in assignment_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for pattern in self._ASSIGNMENT_PATTERNS:
+            for match in pattern.finditer(text):
                 owner = match.group(1).strip()
-                if owner and owner not in owners:
-                    owners.append(owner)
+                if owner:
+                    owners.setdefault(owner)
         
-        return owners
+        return list(owners)
 
 
 class SpacyNER:
     """spaCy-based Named Entity Recognition."""
     
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    # Components entity extraction depends on; the rest can be skipped for NER-only passes
+    _NER_PIPES = ('transformer', 'tok2vec', 'ner')
+    # Never used here; POS tags (tagger + attribute_ruler) are still needed by extract_action_owners
+    _EXCLUDED_PIPES = ('lemmatizer',)
+    
+    def __init__(self, model_name: str = "en_core_web_sm", components: Optional[Tuple[str, ...]] = None):
+        """Initialize spaCy NER.
+        
+        Args:
+            model_name: spaCy model package name
+            components: Pipeline components to keep enabled, e.g. ('ner',) for entity-only use;
+                shared embedding layers stay enabled. None keeps everything both extractors use.
+        """
         self.model_name = model_name
+        self.components = components
         self.nlp = None
         self._initialize_model()
     
@@ -164,8 +240,13 @@ class SpacyNER:
         """Initialize spaCy model."""
         try:
             import spacy
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Loaded spaCy model: {self.model_name}")
+            self.nlp = spacy.load(self.model_name, exclude=list(self._EXCLUDED_PIPES))
+            if self.components is not None:
+                keep = set(self.components) | {'transformer', 'tok2vec'}
+                for name in self.nlp.pipe_names:
+                    if name not in keep:
+                        self.nlp.disable_pipe(name)
+            logger.info(f"Loaded spaCy model: {self.model_name} (pipes: {self.nlp.pipe_names})")
         except ImportError:
             logger.warning("spaCy not available, falling back to rule-based NER")
             raise
@@ -178,7 +259,7 @@ class SpacyNER:
         if not self.nlp:
             raise ValueError("spaCy model not initialized")
         
-        doc = self.nlp(text)
+        doc = self.nlp(text, disable=self._non_ner_pipes())
         entities = []
         
         for ent in doc.ents:
@@ -193,6 +274,66 @@ class SpacyNER:
         
         return entities
     
+    def extract_entities_batch(
+        self, 
+        texts: List[str], 
+        batch_size: int = 64, 
+        n_process: int = 1
+    ) -> List[List[Entity]]:
+        """Extract entities from many texts with batched spaCy inference."""
+        if not self.nlp:
+            raise ValueError("spaCy model not initialized")
+        
+        results = []
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=self._non_ner_pipes())
+        for doc in docs:
+            results.append([
+                Entity(
+                    text=ent.text,
+                    label=ent.label_,
+                    start=ent.start_char,
+                    end=ent.end_char,
+                    confidence=0.9
+                )
+                for ent in doc.ents
+            ])
+        
+        return results
+    
+    def extract_entities_for_segments(
+        self, 
+        segments: List[TranscriptSegment], 
+        batch_size: int = 32
+    ) -> Dict[TranscriptSegment, List[Entity]]:
+        """Extract entities for each transcript segment in one batched spaCy pass."""
+        if not self.nlp:
+            raise ValueError("spaCy model not initialized")
+        
+        results: Dict[TranscriptSegment, List[Entity]] = {}
+        docs = self.nlp.pipe(
+            ((segment.text, segment) for segment in segments), 
+            as_tuples=True, 
+            batch_size=batch_size, 
+            disable=self._non_ner_pipes()
+        )
+        for doc, segment in docs:
+            results[segment] = [
+                Entity(
+                    text=ent.text,
+                    label=ent.label_,
+                    start=ent.start_char,
+                    end=ent.end_char,
+                    confidence=0.9
+                )
+                for ent in doc.ents
+            ]
+        
+        return results
+    
+    def _non_ner_pipes(self) -> List[str]:
+        """Components entity extraction does not use, skipped per call so the shared pipeline is never mutated."""
+        return [name for name in self.nlp.pipe_names if name not in self._NER_PIPES]
+    
     def extract_action_owners(self, text: str) -> List[str]:
         """Extract potential action owners using spaCy's dependency parsing."""
         if not self.nlp:
@@ -218,7 +359,7 @@ def get_entity_recognizer(provider: str = "rule_based", **kwargs) -> Any:
     """Factory function to get entity recognizer based on provider."""
     if provider == "spacy":
         model_name = kwargs.get("model_name", "en_core_web_sm")
-        return SpacyNER(model_name)
+        return SpacyNER(model_name, components=kwargs.get("components"))
     elif provider == "rule_based":
         return RuleBasedNER()
     else:
@@ -1,65 +1,61 @@
 """Centralized model manager for step-specific model selection and loading."""
+import gc
+import importlib
+import importlib.util
 import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Seconds health_check waits for all steps' models before reporting the stragglers as unhealthy
+_HEALTH_CHECK_TIMEOUT = 60
+
 
 class ModelManager:
     """Manages loading and switching between different models for each pipeline step."""
     
+    # Provider -> (module, attribute), imported on first use so creating the manager stays cheap
+    _PROVIDER_IMPORTS = {
+        'ollama': ('app.models.ollama_adapter', 'OllamaAdapter'),
+        'pyannote': ('app.models.diarizer', 'PyAnnoteDiarizer'),
+        'simple': ('app.models.diarizer', 'SimpleDiarizer'),
+        'punctuation': ('app.models.punctuation', 'PunctuationModel'),
+        # Same per-process cache the model adapters use, so one copy of each model serves all of them
+        'sentence_transformers': ('app.models.adapter', '_get_shared_embedding_model'),
+        'spacy': ('spacy', 'load'),
+        'transformers': ('transformers', 'pipeline'),
+        'openai': ('openai', 'OpenAI'),
+    }
+    
+    # Providers that already keep one process-wide instance per model; caching them here too
+    # would only make eviction look like it frees memory
+    _SHARED_PROVIDERS = frozenset({'sentence_transformers'})
+    
     def __init__(self):
-        self._loaded_models: Dict[str, Any] = {}
+        # cache_key -> Future of the loaded model, least recently used first
+        self._loaded_models: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Imported provider entry points; filled on first use of each provider
         self._providers: Dict[str, Any] = {}
-        self._initialize_providers()
     
-    def _initialize_providers(self):
-        """Initialize provider adapters."""
-        # Import providers as needed to avoid circular imports
-        try:
-            from app.models.ollama_adapter import OllamaAdapter
-            self._providers['ollama'] = OllamaAdapter
-        except ImportError:
-            logger.warning("Ollama adapter not available")
-        
-        try:
-            from app.models.diarizer import PyAnnoteDiarizer, SimpleDiarizer
-            self._providers['pyannote'] = PyAnnoteDiarizer
-            self._providers['simple'] = SimpleDiarizer
-        except ImportError:
-            logger.warning("Diarization models not available")
-        
-        try:
-            from app.models.punctuation import PunctuationModel
-            self._providers['punctuation'] = PunctuationModel
-        except ImportError:
-            logger.warning("Punctuation restoration not available")
-        
-        try:
-            from sentence_transformers import SentenceTransformer
-            self._providers['sentence_transformers'] = SentenceTransformer
-        except ImportError:
-            logger.warning("Sentence transformers not available")
-        
-        # Add additional providers with graceful handling
-        try:
-            import spacy
-            self._providers['spacy'] = spacy.load
-        except ImportError:
-            logger.warning("spaCy not available")
-        
-        try:
-            from transformers import pipeline
-            self._providers['transformers'] = pipeline
-        except ImportError:
-            logger.warning("Transformers not available")
-        
-        try:
-            import openai
-            self._providers['openai'] = openai.OpenAI
-        except ImportError:
-            logger.warning("OpenAI not available")
+    def _get_provider(self, name: str) -> Any:
+        """Import a provider's entry point on first use."""
+        provider = self._providers.get(name)
+        if provider is None:
+            module, attribute = self._PROVIDER_IMPORTS[name]
+            try:
+                provider = getattr(importlib.import_module(module), attribute)
+            except ImportError as e:
+                logger.warning(f"{name} provider not available: {e}")
+                raise
+            provider = self._providers.setdefault(name, provider)
+        return provider
     
     def get_model_for_step(self, step: str, **kwargs) -> Any:
         """Get the appropriate model for a specific pipeline step.
@@ -82,17 +78,11 @@ class ModelManager:
         # Create cache key
         cache_key = f"{step}_{provider}_{model_name}"
         
-        # Return cached model if available
-        if cache_key in self._loaded_models:
-            logger.debug(f"Using cached model for {step}: {model_name}")
-            return self._loaded_models[cache_key]
-        
         # Try to load primary model
         try:
-            model = self._load_model(provider, model_name, **kwargs)
-            self._loaded_models[cache_key] = model
-            logger.info(f"Loaded {provider} model for {step}: {model_name}")
-            return model
+            if provider in self._SHARED_PROVIDERS:
+                return self._load_model(provider, model_name, **kwargs)
+            return self._get_or_load(cache_key, step, provider, model_name, **kwargs)
         except Exception as e:
             logger.warning(f"Failed to load primary model {model_name} for {step}: {e}")
             
@@ -100,48 +90,117 @@ class ModelManager:
             if fallback_model:
                 try:
                     fallback_cache_key = f"{step}_{provider}_{fallback_model}"
-                    if fallback_cache_key not in self._loaded_models:
+                    if provider in self._SHARED_PROVIDERS:
                         model = self._load_model(provider, fallback_model, **kwargs)
-                        self._loaded_models[fallback_cache_key] = model
+                    else:
+                        model = self._get_or_load(fallback_cache_key, step, provider, fallback_model, **kwargs)
                     logger.info(f"Using fallback model for {step}: {fallback_model}")
-                    return self._loaded_models[fallback_cache_key]
+                    return model
                 except Exception as fallback_e:
                     logger.error(f"Failed to load fallback model {fallback_model}: {fallback_e}")
             
             # If all fails, try rule-based or simple approaches
             return self._get_simple_fallback(step)
     
+    def _get_or_load(self, cache_key: str, step: str, provider: str, model_name: str, **kwargs) -> Any:
+        """Return a cached model, loading it once even when several callers ask for it concurrently."""
+        with self._lock:
+            future = self._loaded_models.get(cache_key)
+            owner = future is None
+            if owner:
+                future = self._loaded_models[cache_key] = Future()
+            else:
+                self._loaded_models.move_to_end(cache_key)
+        
+        # Another caller is loading (or has loaded) this model; share its result
+        if not owner:
+            logger.debug(f"Using cached model for {step}: {model_name}")
+            return future.result()
+        
+        try:
+            model = self._load_model(provider, model_name, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                if self._loaded_models.get(cache_key) is future:
+                    del self._loaded_models[cache_key]
+            future.set_exception(e)
+            raise
+        
+        future.set_result(model)
+        logger.info(f"Loaded {provider} model for {step}: {model_name}")
+        self._evict_least_recently_used()
+        return model
+    
+    def _evict_least_recently_used(self):
+        """Drop the oldest finished loads once the cache grows past settings.max_cached_models."""
+        evicted = []
+        with self._lock:
+            excess = len(self._loaded_models) - max(settings.max_cached_models, 1)
+            for key in list(self._loaded_models):
+                if excess <= 0:
+                    break
+                # In-flight loads still have waiters; leave them in place
+                if self._loaded_models[key].done():
+                    evicted.append((key, self._loaded_models.pop(key)))
+                    excess -= 1
+        if evicted:
+            self._release_models(evicted)
+    
+    def _release_models(self, entries):
+        """Drop evicted models and hand their memory back to the allocator (drains ``entries``).
+        
+        Models are not closed: callers of get_model_for_step may still be using them, and they
+        are freed once the last of those references goes away.
+        """
+        while entries:
+            key, _ = entries.pop()
+            logger.info(f"Evicting cached model {key}")
+        gc.collect()
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
     def _load_model(self, provider: str, model_name: str, **kwargs) -> Any:
         """Load a specific model with the given provider."""
         if provider == 'ollama':
-            return self._providers['ollama'](model_name, **kwargs)
+            return self._get_provider('ollama')(model_name, **kwargs)
         
         elif provider == 'pyannote':
-            return self._providers['pyannote'](model_name, **kwargs)
+            return self._get_provider('pyannote')(model_name, **kwargs)
         
         elif provider == 'simple':
-            return self._providers['simple'](**kwargs)
+            return self._get_provider('simple')(**kwargs)
         
         elif provider == 'sentence_transformers':
-            return self._providers['sentence_transformers'](model_name, **kwargs)
+            model = self._get_provider('sentence_transformers')(model_name)
+            if model is None:
+                raise ImportError("sentence-transformers is not installed")
+            return model
         
         elif provider == 'local' or provider == 'punctuation':
-            return self._providers['punctuation'](model_name, **kwargs)
+            return self._get_provider('punctuation')(model_name, **kwargs)
         
         elif provider == 'spacy':
-            if 'spacy' not in self._providers:
-                raise ImportError("spaCy not available")
-            return self._providers['spacy'](model_name)
+            return self._get_provider('spacy')(model_name)
         
         elif provider == 'huggingface':
-            if 'transformers' not in self._providers:
-                raise ImportError("Transformers not available")
-            return self._providers['transformers']("text-classification", model=model_name, **kwargs)
+            pipeline_factory = self._get_provider('transformers')
+            from app.models.adapter import _detect_device, _detect_dtype
+            
+            # Stream weights straight into place rather than allocating them twice
+            model_kwargs = dict(kwargs.pop('model_kwargs', None) or {})
+            if importlib.util.find_spec("accelerate") is not None:
+                model_kwargs.setdefault('low_cpu_mem_usage', True)
+                if _detect_device()[1] == 'cuda' and 'device' not in kwargs:
+                    kwargs.setdefault('device_map', 'auto')
+            # Half precision only when the weights actually land on an accelerator
+            if 'device_map' in kwargs or kwargs.get('device', -1) not in (-1, 'cpu'):
+                if _detect_dtype() is not None:
+                    model_kwargs.setdefault('dtype', _detect_dtype())
+            return pipeline_factory("text-classification", model=model_name, model_kwargs=model_kwargs, **kwargs)
         
         elif provider == 'openai':
-            if 'openai' not in self._providers:
-                raise ImportError("OpenAI not available")
-            return self._providers['openai'](api_key=kwargs.get('api_key'))
+            return self._get_provider('openai')(api_key=kwargs.get('api_key'))
         
         else:
             raise ValueError(f"Unknown provider: {provider}")
@@ -178,9 +237,12 @@ class ModelManager:
             settings.models[step]['fallback'] = fallback
         
         # Clear cached models for this step
-        keys_to_remove = [k for k in self._loaded_models.keys() if k.startswith(f"{step}_")]
-        for key in keys_to_remove:
-            del self._loaded_models[key]
+        with self._lock:
+            removed = [(k, self._loaded_models.pop(k)) for k in list(self._loaded_models) if k.startswith(f"{step}_")]
+        # In-flight loads finish for their waiters and are then dropped with the last reference
+        removed = [(k, f) for k, f in removed if f.done()]
+        if removed:
+            self._release_models(removed)
         
         logger.info(f"Updated model config for {step}: {provider}/{model}")
     
@@ -214,13 +276,18 @@ class ModelManager:
         """Check health of all configured models."""
         health = {}
         
+        # Loads are mostly I/O (Ollama HTTP, weight files), so overlap them across steps
+        pool = ThreadPoolExecutor(max_workers=min(len(settings.models), 8) or 1, thread_name_prefix="model-health")
+        futures = {step: pool.submit(self.get_model_for_step, step) for step in settings.models}
+        deadline = time.monotonic() + _HEALTH_CHECK_TIMEOUT
+        
         for step, config in settings.models.items():
             provider = config.get('provider')
             model = config.get('model')
             
             try:
                 # Try to load model
-                self.get_model_for_step(step)
+                futures[step].result(timeout=max(deadline - time.monotonic(), 0))
                 health[step] = {
                     'status': 'healthy',
                     'provider': provider,
@@ -232,9 +299,11 @@ class ModelManager:
                     'status': 'unhealthy', 
                     'provider': provider,
                     'model': model,
-                    'error': str(e)
+                    'error': str(e) or type(e).__name__
                 }
         
+        # Don't block the response on loads that overran the deadline; they finish into the cache
+        pool.shutdown(wait=False)
         return health
 
 
@@ -1,15 +1,56 @@
 """Ollama model adapter for local instruction-following LLM inference."""
+import functools
 import json
+import string
+import weakref
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 try:
-    from sentence_transformers import SentenceTransformer
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SentenceTransformer = None
+    ORJSON_AVAILABLE = False
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Decodes the first JSON object in a response without slicing it out first
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_dumps(payload: Any) -> bytes:
+    """Serialize a request payload to JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a JSON response body (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Specialized extractor prompt behind each extraction kind
+_PROMPT_SOURCES = {
+    'decisions': ('DecisionExtractor', 'DECISION_PROMPT'),
+    'action_items': ('ActionExtractor', 'ACTION_PROMPT'),
+    'risks': ('RiskExtractor', 'RISK_PROMPT'),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _prompt_template(kind: str) -> string.Template:
+    """Compile an extractor prompt into a string.Template once per process."""
+    # Imported on first use: the extractors module pulls in torch and imports the model adapters
+    from app.extraction import specialized_extractors
+    class_name, attribute = _PROMPT_SOURCES[kind]
+    prompt = getattr(getattr(specialized_extractors, class_name), attribute)
+    # Resolve the str.format brace escapes up front and protect literal '$'
+    return string.Template(prompt.replace('$', '$$').format(context='${context}'))
+
 
 class OllamaAdapter:
     """Ollama adapter for local Llama 3 inference with structured extraction capabilities."""
@@ -25,7 +66,15 @@ class OllamaAdapter:
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.embeddings_url = f"{base_url}/api/embeddings"
-        self._embedding_model = None
+        
+        # Keep-alive connection pool shared by every call to the server
+        self._session = requests.Session()
+        pool = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount("http://", pool)
+        self._session.mount("https://", pool)
+        self._session.headers["Content-Type"] = "application/json"
+        # Closes the pool when the adapter is collected or at exit, without keeping the adapter alive
+        self._close_session = weakref.finalize(self, self._session.close)
         
         # Test connection
         self._test_connection()
@@ -33,9 +82,9 @@ class OllamaAdapter:
     def _test_connection(self):
         """Test connection to Ollama server."""
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
-                json={"model": self.model_name, "prompt": "Hello", "stream": False},
+                data=_json_dumps({"model": self.model_name, "prompt": "Hello", "stream": False}),
                 timeout=60  # Increased timeout for cold model loading
             )
             if response.status_code != 200:
@@ -45,6 +94,10 @@ class OllamaAdapter:
             logger.error(f"Failed to connect to Ollama: {e}")
             raise ConnectionError(f"Cannot connect to Ollama server at {self.base_url}")
     
+    def close(self):
+        """Close pooled connections to the Ollama server."""
+        self._close_session()
+    
     def generate_text(self, prompt: str, max_length: int = 2000, temperature: float = 0.1) -> str:
         """Generate text using Ollama.
         
@@ -57,26 +110,16 @@ class OllamaAdapter:
             Generated text
         """
         try:
-            payload = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_length,
-                    "top_p": 0.9,
-                    "stop": ["</JSON>", "END_RESPONSE"]
-                }
-            }
+            payload = self._build_payload(prompt, max_length, temperature, stream=False)
             
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
-                json=payload,
+                data=_json_dumps(payload),
                 timeout=120  # Longer timeout for complex prompts
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 return result.get("response", "").strip()
             else:
                 logger.error(f"Ollama API error: {response.status_code} - {response.text}")
@@ -86,6 +129,40 @@ class OllamaAdapter:
             logger.error(f"Error generating text with Ollama: {e}")
             return ""
     
+    def _build_payload(self, prompt: str, max_length: int, temperature: float, stream: bool) -> Dict[str, Any]:
+        """Build an /api/generate request body."""
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_length,
+                "top_p": 0.9,
+                "stop": ["</JSON>", "END_RESPONSE"]
+            }
+        }
+    
+    def _stream_text(self, prompt: str, max_length: int = 2000, temperature: float = 0.1) -> Iterator[str]:
+        """Yield generated text chunks as Ollama streams them.
+        
+        Closing the generator early closes the response, which drops the connection and
+        stops generation on the server.
+        """
+        payload = self._build_payload(prompt, max_length, temperature, stream=True)
+        with self._session.post(self.api_url, data=_json_dumps(payload), timeout=120, stream=True) as response:
+            if response.status_code != 200:
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                return
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+    
     def extract_structured_data(self, prompt: str, max_length: int = 1500) -> Dict[str, Any]:
         """Extract structured data using Llama 3 with JSON output.
         
@@ -106,45 +183,82 @@ Start your response with {{ and end with }}.
 
 """
         
-        response_text = self.generate_text(structured_prompt, max_length, temperature=0.0)
-        
-        if not response_text:
+        # Stream so parsing can stop generation as soon as the JSON object is complete
+        try:
+            chunks = self._stream_text(structured_prompt, max_length, temperature=0.0)
+            try:
+                return self._parse_json_streaming(chunks)
+            finally:
+                chunks.close()
+        except Exception as e:
+            logger.error(f"Error generating text with Ollama: {e}")
             return {}
+    
+    def _parse_json_streaming(self, chunks: Iterable[str]) -> Dict[str, Any]:
+        """Accumulate streamed text until the first top-level JSON object closes, then parse it."""
+        parts = []
+        depth = 0
+        started = False
+        in_string = False
+        escaped = False
         
-        # Try to extract JSON from response
+        for chunk in chunks:
+            parts.append(chunk)
+            for i, char in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '{':
+                    depth += 1
+                    started = True
+                elif not started:
+                    continue
+                elif char == '"':
+                    in_string = True
+                elif char == '}':
+                    depth -= 1
+                    if depth == 0:
+                        # Object complete; ignore whatever the model would have generated next
+                        parts[-1] = chunk[:i + 1]
+                        return self._parse_json_response(''.join(parts))
+        
+        response_text = ''.join(parts)
+        if not response_text.strip():
+            return {}
         return self._parse_json_response(response_text)
     
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """Parse JSON from LLM response with error handling."""
+        start_idx = response_text.find('{')
         try:
-            # Clean up the response
-            response_text = response_text.strip()
-            
-            # Find JSON boundaries
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}')
-            
-            if start_idx == -1 or end_idx == -1:
+            if start_idx == -1:
                 logger.warning("No JSON found in response")
-                print(f"[DEBUG] OllamaAdapter: No JSON found in response: {response_text[:200]}...")
+                logger.debug("No JSON found in response: %.200s", response_text)
                 return {}
             
-            json_str = response_text[start_idx:end_idx + 1]
-            
-            # Parse JSON
-            result = json.loads(json_str)
-            print(f"[DEBUG] OllamaAdapter: Successfully parsed JSON: {result}")
+            # Usually the object runs to the end of the response; orjson parses that fastest
+            result = None
+            if ORJSON_AVAILABLE:
+                try:
+                    result = orjson.loads(response_text[start_idx:])
+                except orjson.JSONDecodeError:
+                    pass
+            if result is None:
+                # Parse the first complete object; any text the model added after it is ignored
+                result, _ = _JSON_DECODER.raw_decode(response_text, start_idx)
+            logger.debug("Parsed JSON response with keys: %s", list(result) if isinstance(result, dict) else type(result).__name__)
             return result
             
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {e}")
             logger.error(f"Response text: {response_text}")
-            print(f"[DEBUG] OllamaAdapter: JSON parse error: {e}")
-            print(f"[DEBUG] OllamaAdapter: Attempted to parse: {json_str[:200] if 'json_str' in locals() else 'N/A'}...")
             return {}
         except Exception as e:
             logger.error(f"Error parsing response: {e}")
-            print(f"[DEBUG] OllamaAdapter: Error parsing response: {e}")
             return {}
     
     def summarize(self, text: str, max_length: int = 250, min_length: int = 100) -> str:
@@ -206,43 +320,31 @@ JSON:"""
     
     def get_embedding_model(self):
         """Get sentence transformer model for embeddings."""
-        if self._embedding_model is None:
-            try:
-                if SentenceTransformer is None:
-                    logger.error("SentenceTransformer not available")
-                    return None
-                self._embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-            except Exception as e:
-                logger.error(f"Failed to load embedding model: {e}")
-                return None
-        return self._embedding_model
+        try:
+            # Same process-wide instance the local and hybrid adapters use
+            from app.models.adapter import _get_shared_embedding_model
+            return _get_shared_embedding_model()
+        except Exception as e:
+            logger.error(f"Failed to load embedding model: {e}")
+            return None
     
     def extract_decisions(self, context: str) -> List[Dict[str, Any]]:
         """Extract decisions using the enhanced decision prompt."""
-        from app.extraction.specialized_extractors import DecisionExtractor
-        
-        extractor = DecisionExtractor(self, self.get_embedding_model())
-        prompt = extractor.DECISION_PROMPT.format(context=context)
+        prompt = _prompt_template('decisions').substitute(context=context)
         
         response = self.extract_structured_data(prompt)
         return response.get("decisions", [])
     
     def extract_actions(self, context: str) -> List[Dict[str, Any]]:
         """Extract action items using the enhanced action prompt.""" 
-        from app.extraction.specialized_extractors import ActionExtractor
-        
-        extractor = ActionExtractor(self, self.get_embedding_model())
-        prompt = extractor.ACTION_PROMPT.format(context=context)
+        prompt = _prompt_template('action_items').substitute(context=context)
         
         response = self.extract_structured_data(prompt)
         return response.get("action_items", [])
     
     def extract_risks(self, context: str) -> List[Dict[str, Any]]:
         """Extract risks using the enhanced risk prompt."""
-        from app.extraction.specialized_extractors import RiskExtractor
-        
-        extractor = RiskExtractor(self, self.get_embedding_model())
-        prompt = extractor.RISK_PROMPT.format(context=context)
+        prompt = _prompt_template('risks').substitute(context=context)
         
         response = self.extract_structured_data(prompt)
         return response.get("risks", [])
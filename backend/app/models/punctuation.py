@@ -339,7 +339,7 @@ class CoreferenceResolver:
                 
                 # Track mentions of other speakers
                 for speaker in context['speakers']:
-                    if speaker.lower() in segment.text.lower() and speaker != segment.speaker:
+                    if speaker.lower() in segment.text_lower and speaker != segment.speaker:
                         if speaker not in context['speaker_mentions']:
                             context['speaker_mentions'][speaker] = []
                         context['speaker_mentions'][speaker].append(segment.speaker)
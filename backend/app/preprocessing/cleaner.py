@@ -12,16 +12,22 @@ os.environ.setdefault('HF_HUB_DISABLE_SSL_WARNING', '1')
 # Try to import sentence_transformers with SSL workaround
 try:
     from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
     import numpy as np
     EMBEDDING_AVAILABLE = True
 except ImportError:
     EMBEDDING_AVAILABLE = False
-    print("Warning: sentence-transformers or sklearn not available. Topic segmentation disabled.")
+    print("Warning: sentence-transformers not available. Topic segmentation disabled.")
 
 from app.config.settings import settings
 
 
+def _adjacent_cosine(embeddings) -> "np.ndarray":
+    """Cosine similarity between each embedding row and the row before it."""
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return np.einsum('ij,ij->i', vectors[:-1], vectors[1:])
+
+
 class TranscriptCleaner:
     """Advanced transcript cleaning and preprocessing."""
     
@@ -138,7 +144,7 @@ class TranscriptCleaner:
         
         filtered = []
         for seg in segments:
-            text_lower = seg.text.lower().strip()
+            text_lower = seg.text_lower.strip()
             # Skip if it's just small talk
             is_small_talk = any(re.match(pattern, text_lower) for pattern in small_talk_patterns)
             
@@ -315,17 +321,15 @@ class TranscriptCleaner:
             print(f"Warning: Could not generate embeddings: {e}")
             return [segments]
         
+        # Cosine similarity of each window with the previous one
+        adjacent_similarity = _adjacent_cosine(embeddings)
+        
         # Find topic boundaries using cosine similarity
         topic_segments = []
         current_topic = [windows[0]]
         
         for i in range(1, len(windows)):
-            similarity = cosine_similarity(
-                embeddings[i-1:i],
-                embeddings[i:i+1]
-            )[0][0]
-            
-            if similarity < threshold:
+            if adjacent_similarity[i - 1] < threshold:
                 # Topic shift detected
                 topic_segments.append(current_topic)
                 current_topic = [windows[i]]
@@ -372,6 +376,9 @@ class TranscriptCleaner:
             print(f"Warning: Could not generate embeddings for chunking: {e}")
             return self._simple_chunk(text, max_tokens)
         
+        # Cosine similarity of each sentence with the previous one
+        adjacent_similarity = _adjacent_cosine(sentence_embeddings)
+        
         # Build chunks using semantic similarity
         chunks = []
         current_chunk = []
@@ -393,10 +400,7 @@ class TranscriptCleaner:
                 current_tokens = sentence_tokens
             else:
                 # Check semantic similarity with previous sentence
-                similarity = cosine_similarity(
-                    sentence_embeddings[i-1:i],
-                    sentence_embeddings[i:i+1]
-                )[0][0]
+                similarity = adjacent_similarity[i - 1]
                 
                 # If similarity is high and we haven't exceeded min_tokens, keep in same chunk
                 if similarity > 0.7 and current_tokens >= min_tokens:
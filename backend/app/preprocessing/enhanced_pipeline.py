@@ -123,12 +123,17 @@ class EnhancedPreprocessingPipeline:
             if hasattr(diarizer, 'diarize_audio'):
                 # Audio-based diarization
                 logger.info("Applying audio-based diarization")
-                diarization_segments = diarizer.diarize_audio(audio_path)
+                series_id = calendar_metadata.get('meeting_series_id') if calendar_metadata else None
+                series_speakers = None
+                if series_id:
+                    diarization_segments, series_speakers = diarizer.diarize_series(audio_path, series_id)
+                else:
+                    diarization_segments = diarizer.diarize_audio(audio_path)
                 segments = diarizer.assign_speakers_to_segments(segments, diarization_segments)
                 
                 # Resolve speaker names using calendar
                 if calendar_metadata:
-                    segments = diarizer.resolve_speaker_names(segments, calendar_metadata)
+                    segments = diarizer.resolve_speaker_names(segments, calendar_metadata, series_speakers)
                 
                 metadata['components_used'].append('audio_diarization')
                 metadata['diarization_segments'] = len(diarization_segments)
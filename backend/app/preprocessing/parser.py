@@ -1,6 +1,7 @@
 """Multi-format transcript parser."""
 import json
 import re
+from functools import cached_property
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from datetime import timedelta
@@ -13,6 +14,17 @@ class TranscriptSegment:
         self.speaker = speaker
         self.timestamp = timestamp
     
+    @cached_property
+    def text_lower(self) -> str:
+        """Lowercased text, computed once (text is only set at construction)."""
+        return self.text.lower()
+    
+    def with_speaker(self, speaker: Optional[str]) -> "TranscriptSegment":
+        """Return a segment with the given speaker, reusing this one when it is unchanged."""
+        if speaker == self.speaker:
+            return self
+        return TranscriptSegment(text=self.text, speaker=speaker, timestamp=self.timestamp)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert segment to dictionary."""
         return {